@@ -0,0 +1,35 @@
+"""Add name and unit cost check constraints
+
+Revision ID: 1b9d5e0a7c63
+Revises: 0a6e2f4c8d91
+Create Date: 2026-10-16 16:20:13.640518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b9d5e0a7c63'
+down_revision: Union[str, Sequence[str], None] = '0a6e2f4c8d91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.create_check_constraint('name_nonempty', 'length(name) >= 1')
+    with op.batch_alter_table('materials') as batch_op:
+        batch_op.create_check_constraint('name_nonempty', 'length(name) >= 1')
+        batch_op.create_check_constraint('unit_cost_positive', 'unit_cost > 0')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('materials') as batch_op:
+        batch_op.drop_constraint('unit_cost_positive', type_='check')
+        batch_op.drop_constraint('name_nonempty', type_='check')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_constraint('name_nonempty', type_='check')
@@ -0,0 +1,84 @@
+"""Store JSON columns as native JSON
+
+Revision ID: 8f3a1c2d9b47
+Revises: 2d639c1c4665
+Create Date: 2026-10-16 09:12:31.204117
+
+"""
+import ast
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a1c2d9b47'
+down_revision: Union[str, Sequence[str], None] = '2d639c1c4665'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = {
+    'elements': ['bounding_box'],
+    'reports': ['summary_data'],
+    'steel_elements': ['bbox', 'text_references', 'properties'],
+    'concrete_elements': ['bbox', 'text_references', 'properties'],
+}
+
+
+def _repair_report_summaries() -> None:
+    """Reports used to store str(dict); rewrite those rows as real JSON."""
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, summary_data FROM reports WHERE summary_data IS NOT NULL"
+    )).fetchall()
+    for report_id, raw in rows:
+        try:
+            json.loads(raw)
+            continue
+        except ValueError:
+            pass
+        try:
+            fixed = json.dumps(ast.literal_eval(raw), default=str)
+        except (ValueError, SyntaxError):
+            fixed = None
+        conn.execute(
+            sa.text("UPDATE reports SET summary_data = :data WHERE id = :id"),
+            {"data": fixed, "id": report_id},
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _repair_report_summaries()
+
+    if op.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import JSONB
+        for table, columns in JSON_COLUMNS.items():
+            for column in columns:
+                op.alter_column(
+                    table, column,
+                    type_=JSONB(),
+                    postgresql_using=f'{column}::jsonb',
+                )
+    else:
+        # SQLite keeps JSON as TEXT; only the declared type changes
+        for table, columns in JSON_COLUMNS.items():
+            with op.batch_alter_table(table) as batch_op:
+                for column in columns:
+                    batch_op.alter_column(column, type_=sa.JSON())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    for table, columns in JSON_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    type_=sa.Text(),
+                    **({'postgresql_using': f'{column}::text'} if is_postgres else {}),
+                )
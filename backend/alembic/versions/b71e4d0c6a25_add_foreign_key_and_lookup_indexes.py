@@ -0,0 +1,48 @@
+"""Add foreign key and lookup indexes
+
+Revision ID: b71e4d0c6a25
+Revises: 8f3a1c2d9b47
+Create Date: 2026-10-16 10:03:47.551862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e4d0c6a25'
+down_revision: Union[str, Sequence[str], None] = '8f3a1c2d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_drawings_project_id', 'drawings', ['project_id']),
+    ('ix_elements_project_id', 'elements', ['project_id']),
+    ('ix_elements_material_id', 'elements', ['material_id']),
+    ('ix_element_drawing_type', 'elements', ['drawing_id', 'element_type']),
+    ('ix_reports_project_id', 'reports', ['project_id']),
+    ('ix_cost_database_material_id', 'cost_database', ['material_id']),
+    ('ix_cost_region_year_material', 'cost_database', ['region', 'year', 'material_id']),
+    ('ix_steel_drawing_section', 'steel_elements', ['drawing_id', 'section_name']),
+    ('ix_concrete_elements_drawing_id', 'concrete_elements', ['drawing_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY can't run inside a transaction, and avoids locking writes
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
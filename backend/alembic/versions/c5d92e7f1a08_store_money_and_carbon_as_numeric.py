@@ -0,0 +1,42 @@
+"""Store money and carbon columns as numeric
+
+Revision ID: c5d92e7f1a08
+Revises: b71e4d0c6a25
+Create Date: 2026-10-16 11:26:05.318440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d92e7f1a08'
+down_revision: Union[str, Sequence[str], None] = 'b71e4d0c6a25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+NUMERIC_COLUMNS = {
+    'projects': {'total_cost': sa.Numeric(14, 2), 'carbon_footprint': sa.Numeric(14, 4)},
+    'materials': {'unit_cost': sa.Numeric(14, 2), 'carbon_factor': sa.Numeric(12, 4)},
+    'reports': {'total_cost': sa.Numeric(14, 2), 'total_carbon': sa.Numeric(14, 4)},
+    'cost_database': {'labor_cost': sa.Numeric(14, 2), 'equipment_cost': sa.Numeric(14, 2)},
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, columns in NUMERIC_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column, type_ in columns.items():
+                batch_op.alter_column(column, existing_type=sa.Float(), type_=type_)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in NUMERIC_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column, type_ in columns.items():
+                batch_op.alter_column(column, existing_type=type_, type_=sa.Float())
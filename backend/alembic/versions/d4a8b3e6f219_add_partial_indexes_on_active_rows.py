@@ -0,0 +1,40 @@
+"""Add partial indexes on active materials and cost rows
+
+Revision ID: d4a8b3e6f219
+Revises: c5d92e7f1a08
+Create Date: 2026-10-16 12:08:52.774031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8b3e6f219'
+down_revision: Union[str, Sequence[str], None] = 'c5d92e7f1a08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    active = sa.text('is_active')
+    # SQLite only uses a partial index when the query repeats its predicate
+    # verbatim, and the ORM renders `is_active == True` as `is_active = 1`
+    sqlite_active = sa.text('is_active = 1')
+    op.create_index(
+        'ix_material_active_category', 'materials', ['category'],
+        postgresql_where=active, sqlite_where=sqlite_active,
+    )
+    op.create_index(
+        'ix_cost_active_region_material', 'cost_database', ['region', 'material_id'],
+        postgresql_where=active, sqlite_where=sqlite_active,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_cost_active_region_material', table_name='cost_database')
+    op.drop_index('ix_material_active_category', table_name='materials')
@@ -0,0 +1,117 @@
+"""Add trigger-maintained element aggregates to projects
+
+Revision ID: e9b6c14d7f30
+Revises: d4a8b3e6f219
+Create Date: 2026-10-16 13:41:19.086527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b6c14d7f30'
+down_revision: Union[str, Sequence[str], None] = 'd4a8b3e6f219'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigger DDL as of this revision, copied rather than imported from the
+# models so later edits there don't change what this migration does
+PROJECT_TOTALS_TRIGGERS = {
+    "sqlite": [
+        """
+        CREATE TRIGGER trg_elements_totals_insert AFTER INSERT ON elements
+        BEGIN
+            UPDATE projects SET element_count = element_count + 1,
+                computed_total_area = computed_total_area + COALESCE(NEW.area, 0),
+                computed_total_volume = computed_total_volume + COALESCE(NEW.volume, 0)
+            WHERE id = NEW.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_elements_totals_delete AFTER DELETE ON elements
+        BEGIN
+            UPDATE projects SET element_count = element_count - 1,
+                computed_total_area = computed_total_area - COALESCE(OLD.area, 0),
+                computed_total_volume = computed_total_volume - COALESCE(OLD.volume, 0)
+            WHERE id = OLD.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_elements_totals_update
+        AFTER UPDATE OF project_id, area, volume ON elements
+        BEGIN
+            UPDATE projects SET element_count = element_count - 1,
+                computed_total_area = computed_total_area - COALESCE(OLD.area, 0),
+                computed_total_volume = computed_total_volume - COALESCE(OLD.volume, 0)
+            WHERE id = OLD.project_id;
+            UPDATE projects SET element_count = element_count + 1,
+                computed_total_area = computed_total_area + COALESCE(NEW.area, 0),
+                computed_total_volume = computed_total_volume + COALESCE(NEW.volume, 0)
+            WHERE id = NEW.project_id;
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION elements_project_totals() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE projects SET element_count = element_count - 1,
+                    computed_total_area = computed_total_area - COALESCE(OLD.area, 0),
+                    computed_total_volume = computed_total_volume - COALESCE(OLD.volume, 0)
+                WHERE id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE projects SET element_count = element_count + 1,
+                    computed_total_area = computed_total_area + COALESCE(NEW.area, 0),
+                    computed_total_volume = computed_total_volume + COALESCE(NEW.volume, 0)
+                WHERE id = NEW.project_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER trg_elements_project_totals
+        AFTER INSERT OR DELETE OR UPDATE OF project_id, area, volume ON elements
+        FOR EACH ROW EXECUTE FUNCTION elements_project_totals()
+        """,
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.add_column(sa.Column('element_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('computed_total_area', sa.Float(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('computed_total_volume', sa.Float(), nullable=False, server_default='0'))
+
+    # Backfill from existing elements before the triggers take over
+    op.execute("""
+        UPDATE projects SET
+            element_count = (SELECT COUNT(*) FROM elements WHERE elements.project_id = projects.id),
+            computed_total_area = (SELECT COALESCE(SUM(area), 0) FROM elements WHERE elements.project_id = projects.id),
+            computed_total_volume = (SELECT COALESCE(SUM(volume), 0) FROM elements WHERE elements.project_id = projects.id)
+    """)
+
+    for statement in PROJECT_TOTALS_TRIGGERS.get(op.get_bind().dialect.name, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS trg_elements_project_totals ON elements")
+        op.execute("DROP FUNCTION IF EXISTS elements_project_totals()")
+    else:
+        for name in ('insert', 'delete', 'update'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_elements_totals_{name}")
+
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('computed_total_volume')
+        batch_op.drop_column('computed_total_area')
+        batch_op.drop_column('element_count')
@@ -0,0 +1,35 @@
+"""Add GIN index on report summaries
+
+Revision ID: f1c7a9e3b502
+Revises: e9b6c14d7f30
+Create Date: 2026-10-16 14:37:08.412995
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a9e3b502'
+down_revision: Union[str, Sequence[str], None] = 'e9b6c14d7f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # JSONB and GIN are PostgreSQL-only; SQLite keeps scanning JSON text
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.create_index(
+        'ix_report_summary_gin', 'reports', ['summary_data'],
+        postgresql_using='gin', postgresql_ops={'summary_data': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_report_summary_gin', table_name='reports')
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, lazyload
 import os
 
 from ..core.database import get_db
@@ -18,7 +19,7 @@ async def calculate_project_costs(
 ):
     """Calculate total costs for a project"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -40,29 +41,19 @@ async def calculate_project_costs(
 async def get_all_project_costs(db: Session = Depends(get_db)):
     """Get total costs across all projects"""
     try:
-        # Get all projects
-        projects = db.query(Project).all()
+        project_count = db.query(func.count(Project.id)).scalar()
         
-        total_cost = 0
-        total_elements = 0
-        total_area = 0
-        
-        # Calculate costs for each project
-        for project in projects:
-            try:
-                summary = cost_calculator.calculate_project_costs(db, project.id)
-                total_cost += summary.total_cost
-                total_elements += summary.total_elements
-                total_area += summary.total_area
-            except Exception as e:
-                print(f"Error calculating costs for project {project.id}: {e}")
-                continue
+        # One grouped query covers every project; projects without elements add nothing
+        summaries = cost_calculator.calculate_costs_by_project(db).values()
+        total_cost = sum(summary.total_cost for summary in summaries)
+        total_elements = sum(summary.total_elements for summary in summaries)
+        total_area = sum(summary.total_area for summary in summaries)
         
         return {
             "total_cost": total_cost,
             "total_elements": total_elements,
             "total_area": total_area,
-            "project_count": len(projects)
+            "project_count": project_count
         }
     except Exception as e:
         raise HTTPException(
@@ -92,7 +83,7 @@ async def analyze_project_carbon(
 ):
     """Analyze carbon footprint for a project"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -100,7 +91,7 @@ async def analyze_project_carbon(
             )
         
         # Get all drawings for the project
-        drawings = db.query(Drawing).filter(Drawing.project_id == project_id).all()
+        drawings = db.query(Drawing).options(lazyload("*")).filter(Drawing.project_id == project_id).all()
         
         if not drawings:
             return {
@@ -199,7 +190,7 @@ async def analyze_drawing_carbon(
 ):
     """Analyze carbon footprint for a specific drawing"""
     try:
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
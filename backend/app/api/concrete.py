@@ -3,11 +3,11 @@ Concrete API endpoints for detecting and measuring concrete elements
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from typing import List, Dict, Any
 import os
-import json
 import logging
+import math
 
 from ..core.database import get_db
 from ..models.models import Drawing, ConcreteElement
@@ -22,7 +22,7 @@ async def detect_concrete_elements(drawing_id: int, db: Session = Depends(get_db
     """Detect concrete elements in a drawing and calculate volumes"""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -36,31 +36,29 @@ async def detect_concrete_elements(drawing_id: int, db: Session = Depends(get_db
         concrete_elements = processor.process_drawing_for_concrete(drawing_path)
         
         # Save to database
-        saved_elements = []
-        for element in concrete_elements:
-            db_element = ConcreteElement(
-                drawing_id=drawing_id,
-                element_type=element.element_type,
-                concrete_grade=element.grade,
-                length_m=element.dimensions.length,
-                width_m=element.dimensions.width,
-                depth_m=element.dimensions.depth,
-                volume_m3=element.dimensions.volume,
-                confidence_score=element.dimensions.confidence,
-                description=element.description,
-                text_references=json.dumps([element.dimensions.text_reference]),
-                location=element.location
-            )
-            db.add(db_element)
-            saved_elements.append(db_element)
-        
+        ConcreteElement.bulk_create(db, [
+            {
+                'drawing_id': drawing_id,
+                'element_type': element.element_type,
+                'concrete_grade': element.grade,
+                'length_m': element.dimensions.length,
+                'width_m': element.dimensions.width,
+                'depth_m': element.dimensions.depth,
+                'volume_m3': element.dimensions.volume,
+                'confidence_score': element.dimensions.confidence,
+                'description': element.description,
+                'text_references': [element.dimensions.text_reference],
+                'location': element.location,
+            }
+            for element in concrete_elements
+        ], returning=False)
         db.commit()
         
         # Generate report
         report = processor.generate_concrete_report(concrete_elements)
         
         return {
-            "message": f"Detected {len(saved_elements)} concrete elements",
+            "message": f"Detected {len(concrete_elements)} concrete elements",
             "elements": report,
             "drawing_id": drawing_id
         }
@@ -74,7 +72,7 @@ async def get_concrete_elements(drawing_id: int, db: Session = Depends(get_db)):
     """Get concrete elements for a specific drawing"""
     try:
         # Check if drawing exists
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -104,7 +102,7 @@ async def get_concrete_elements(drawing_id: int, db: Session = Depends(get_db)):
             "drawing_id": drawing_id,
             "elements": formatted_elements,
             "total_elements": len(formatted_elements),
-            "total_volume_m3": sum(e.volume_m3 for e in elements)
+            "total_volume_m3": math.fsum(e.volume_m3 for e in elements)
         }
         
     except Exception as e:
@@ -116,7 +114,7 @@ async def get_concrete_report(drawing_id: int, db: Session = Depends(get_db)):
     """Get a comprehensive concrete measurement report for a drawing"""
     try:
         # Check if drawing exists
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -173,7 +171,7 @@ async def get_project_concrete_summary(project_id: int, db: Session = Depends(ge
     """Get concrete summary for all drawings in a project"""
     try:
         # Get all drawings for the project
-        drawings = db.query(Drawing).filter(Drawing.project_id == project_id).all()
+        drawings = db.query(Drawing).options(lazyload("*")).filter(Drawing.project_id == project_id).all()
         
         if not drawings:
             raise HTTPException(status_code=404, detail="Project not found")
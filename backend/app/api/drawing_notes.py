@@ -7,7 +7,7 @@ steel grades, and construction details.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from typing import List, Dict, Any
 import os
 import json
@@ -15,7 +15,7 @@ import logging
 
 from ..core.database import get_db
 from ..models.models import Drawing
-from ..services.pdf_processor import PDFProcessor
+from ..services.pdf_processor import pdf_processor
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +26,7 @@ async def analyze_drawing_notes(drawing_id: int, db: Session = Depends(get_db)):
     """Analyze drawing notes and extract specifications."""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -35,8 +35,7 @@ async def analyze_drawing_notes(drawing_id: int, db: Session = Depends(get_db)):
         if not os.path.exists(drawing_path):
             raise HTTPException(status_code=404, detail="Drawing file not found")
         
-        # Initialize processor
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         if not processor.notes_analyzer:
             raise HTTPException(
@@ -86,7 +85,7 @@ async def apply_notes_to_elements(drawing_id: int, elements: List[Dict], db: Ses
     """Apply drawing notes to detected elements."""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -95,8 +94,7 @@ async def apply_notes_to_elements(drawing_id: int, elements: List[Dict], db: Ses
         if not os.path.exists(drawing_path):
             raise HTTPException(status_code=404, detail="Drawing file not found")
         
-        # Initialize processor
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         if not processor.notes_analyzer:
             raise HTTPException(
@@ -132,7 +130,7 @@ async def get_drawing_notes_statistics(drawing_id: int, db: Session = Depends(ge
     """Get statistics about drawing notes analysis."""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -141,8 +139,7 @@ async def get_drawing_notes_statistics(drawing_id: int, db: Session = Depends(ge
         if not os.path.exists(drawing_path):
             raise HTTPException(status_code=404, detail="Drawing file not found")
         
-        # Initialize processor
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         if not processor.notes_analyzer:
             raise HTTPException(
@@ -181,7 +178,7 @@ async def extract_material_specifications(drawing_id: int, db: Session = Depends
     """Extract material specifications from drawing notes."""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -190,8 +187,7 @@ async def extract_material_specifications(drawing_id: int, db: Session = Depends
         if not os.path.exists(drawing_path):
             raise HTTPException(status_code=404, detail="Drawing file not found")
         
-        # Initialize processor
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         if not processor.notes_analyzer:
             raise HTTPException(
@@ -256,7 +252,7 @@ async def extract_material_specifications(drawing_id: int, db: Session = Depends
 async def get_notes_analysis_capabilities():
     """Get information about drawing notes analysis capabilities."""
     try:
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         capabilities = {
             "notes_analyzer_available": processor.notes_analyzer is not None,
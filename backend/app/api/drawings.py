@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks, Form
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload, load_only, raiseload, selectinload
 from typing import List
 import os
 import shutil
@@ -7,12 +7,11 @@ from datetime import datetime
 
 from ..core.database import get_db
 from ..core.config import settings
-from ..models.models import Drawing, Project, Element
+from ..models.models import Drawing, Project, Element, ELEMENT_LIST_COLUMNS
 from ..models.schemas import Drawing as DrawingSchema, DrawingWithElements, FileUploadResponse
-from ..services.pdf_processor import PDFProcessor
+from ..services.pdf_processor import pdf_processor
 
 router = APIRouter()
-pdf_processor = PDFProcessor()
 
 
 @router.post("/upload/{project_id}", response_model=FileUploadResponse)
@@ -41,7 +40,7 @@ async def upload_drawing(
     """
     try:
         # Validate project exists
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -53,7 +52,7 @@ async def upload_drawing(
         if file_extension not in settings.allowed_file_types:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type {file_extension} not allowed. Allowed types: {settings.allowed_file_types}"
+                detail=f"File type {file_extension} not allowed. Allowed types: {sorted(settings.allowed_file_types)}"
             )
         
         # Validate file size
@@ -89,7 +88,7 @@ async def upload_drawing(
         
         db.add(drawing)
         db.commit()
-        db.refresh(drawing)
+        db.refresh(drawing, attribute_names=["id"])
         
         # Start background processing for PDF files
         if file_extension == ".pdf" and background_tasks:
@@ -130,7 +129,7 @@ def process_pdf_drawing(drawing_id: int, file_path: str, discipline: str, db: Se
     
     try:
         # Update status to processing
-        drawing = db_session.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db_session.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if drawing:
             drawing.processing_status = "processing"
             db_session.commit()
@@ -141,17 +140,17 @@ def process_pdf_drawing(drawing_id: int, file_path: str, discipline: str, db: Se
         
         # Save detected elements to database
         if results.get('total_elements', 0) > 0:
-            for element_data in results.get('elements', []):
-                element = Element(
-                    drawing_id=drawing_id,
-                    element_type=element_data.get('type', 'unknown'),
-                    quantity=element_data.get('quantity', 1),
-                    unit=element_data.get('unit', 'unit'),
-                    area=element_data.get('properties', {}).get('area'),
-                    confidence_score=element_data.get('confidence', 0.0)
-                )
-                db_session.add(element)
-            
+            Element.bulk_create(db_session, [
+                {
+                    'drawing_id': drawing_id,
+                    'element_type': element_data.get('type', 'unknown'),
+                    'quantity': element_data.get('quantity', 1),
+                    'unit': element_data.get('unit', 'unit'),
+                    'area': element_data.get('properties', {}).get('area'),
+                    'confidence_score': element_data.get('confidence', 0.0),
+                }
+                for element_data in results.get('elements', [])
+            ], returning=False)
             db_session.commit()
         
         # Update drawing status to completed
@@ -164,7 +163,7 @@ def process_pdf_drawing(drawing_id: int, file_path: str, discipline: str, db: Se
     except Exception as e:
         print(f"ERROR: Failed to process drawing {drawing_id}: {e}")
         # Update drawing status to failed
-        drawing = db_session.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db_session.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if drawing:
             drawing.processing_status = "failed"
             db_session.commit()
@@ -176,7 +175,12 @@ def process_pdf_drawing(drawing_id: int, file_path: str, discipline: str, db: Se
 async def get_all_drawings(db: Session = Depends(get_db)):
     """Get all drawings across all projects"""
     try:
-        drawings = db.query(Drawing).all()
+        drawings = db.query(Drawing).options(
+            selectinload(Drawing.elements).options(
+                load_only(*ELEMENT_LIST_COLUMNS), lazyload(Element.material)
+            ),
+            raiseload("*"),
+        ).all()
         return drawings
     except Exception as e:
         raise HTTPException(
@@ -193,7 +197,7 @@ async def get_project_drawings(
     """Get all drawings for a project with their elements"""
     try:
         # Validate project exists
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -201,7 +205,12 @@ async def get_project_drawings(
             )
         
         # Get drawings with their elements
-        drawings = db.query(Drawing).filter(Drawing.project_id == project_id).all()
+        drawings = db.query(Drawing).options(
+            selectinload(Drawing.elements).options(
+                load_only(*ELEMENT_LIST_COLUMNS), lazyload(Element.material)
+            ),
+            raiseload("*"),
+        ).filter(Drawing.project_id == project_id).all()
         return drawings
         
     except HTTPException:
@@ -220,7 +229,7 @@ async def get_drawing(
 ):
     """Get a specific drawing by ID"""
     try:
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(raiseload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -244,7 +253,7 @@ async def delete_drawing(
 ):
     """Delete a drawing and its file"""
     try:
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -290,7 +299,7 @@ async def reprocess_drawing(
 ):
     """Reprocess a drawing"""
     try:
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
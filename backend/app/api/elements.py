@@ -1,30 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session, lazyload, load_only
 from typing import List
 
-from ..core.database import get_db
-from ..models.models import Element, Project
-from ..models.schemas import ElementCreate, Element as ElementSchema
+from ..core.database import get_db, SessionLocal
+from ..models.models import Drawing, Element, Project, ELEMENT_LIST_COLUMNS
+from ..models.schemas import ElementCreate, ElementListItem, Element as ElementSchema
 
 router = APIRouter()
 
+# Validates and serialises a whole element list in one pass of pydantic-core
+_ELEMENT_LIST_ADAPTER = TypeAdapter(List[ElementListItem])
 
-@router.get("/project/{project_id}", response_model=List[ElementSchema])
+# Rows fetched per round trip when streaming large element lists
+STREAM_BATCH_SIZE = 500
+
+
+@router.get("/project/{project_id}", response_model=List[ElementListItem])
 async def get_project_elements(
     project_id: int,
     db: Session = Depends(get_db)
 ):
     """Get all elements for a project"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
         
-        elements = db.query(Element).filter(Element.project_id == project_id).all()
-        return elements
+        elements = db.query(Element).options(
+            load_only(*ELEMENT_LIST_COLUMNS), lazyload(Element.material)
+        ).filter(Element.project_id == project_id).all()
+        return Response(
+            content=_ELEMENT_LIST_ADAPTER.dump_json(_ELEMENT_LIST_ADAPTER.validate_python(elements)),
+            media_type="application/json",
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -34,6 +48,37 @@ async def get_project_elements(
         )
 
 
+@router.get("/drawing/{drawing_id}/stream")
+async def stream_drawing_elements(
+    drawing_id: int,
+    db: Session = Depends(get_db)
+):
+    """Stream a drawing's elements as NDJSON, one element per line"""
+    if db.query(Drawing.id).filter(Drawing.id == drawing_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Drawing not found"
+        )
+    
+    def generate_ndjson():
+        # The request session is closed before the body finishes streaming,
+        # so the generator owns its own session
+        stream_db = SessionLocal()
+        try:
+            rows = stream_db.scalars(
+                select(Element)
+                .options(load_only(*ELEMENT_LIST_COLUMNS), lazyload(Element.material))
+                .where(Element.drawing_id == drawing_id)
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            for row in rows:
+                yield ElementListItem.model_validate(row).model_dump_json().encode() + b"\n"
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+
 @router.get("/{element_id}", response_model=ElementSchema)
 async def get_element(
     element_id: int,
@@ -6,7 +6,7 @@ cross-drawing reference analysis for improved measurement accuracy.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from typing import List, Dict, Any
 import os
 import json
@@ -14,7 +14,7 @@ import logging
 
 from ..core.database import get_db
 from ..models.models import Drawing
-from ..services.pdf_processor import PDFProcessor
+from ..services.pdf_processor import PDFProcessor, pdf_processor
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,7 @@ async def enhanced_drawing_analysis(drawing_id: int, db: Session = Depends(get_d
     """Perform enhanced analysis with cross-drawing references."""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
@@ -34,8 +34,7 @@ async def enhanced_drawing_analysis(drawing_id: int, db: Session = Depends(get_d
         if not os.path.exists(drawing_path):
             raise HTTPException(status_code=404, detail="Drawing file not found")
         
-        # Initialize enhanced processor
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         # Perform enhanced analysis
         enhanced_results = processor.process_drawing_with_cross_references(
@@ -64,12 +63,12 @@ async def get_cross_references(drawing_id: int, db: Session = Depends(get_db)):
     """Get cross-references for a drawing."""
     try:
         # Get drawing
-        drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+        drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         
         # Get cross-references
-        processor = PDFProcessor()
+        processor = pdf_processor
         cross_references = processor.get_drawing_cross_references(drawing_id)
         
         return {
@@ -87,13 +86,12 @@ async def enhanced_project_analysis(project_id: int, db: Session = Depends(get_d
     """Perform enhanced analysis for all drawings in a project."""
     try:
         # Get all drawings for the project
-        drawings = db.query(Drawing).filter(Drawing.project_id == project_id).all()
+        drawings = db.query(Drawing).options(lazyload("*")).filter(Drawing.project_id == project_id).all()
         
         if not drawings:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        # Initialize processor
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         # Process each drawing with enhanced analysis
         project_results = {
@@ -156,7 +154,7 @@ async def enhanced_project_analysis(project_id: int, db: Session = Depends(get_d
 async def get_enhanced_analysis_statistics(db: Session = Depends(get_db)):
     """Get statistics about enhanced analysis capabilities."""
     try:
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         # Check if reference analysis is available
         reference_analysis_available = processor.reference_analyzer is not None
@@ -190,7 +188,7 @@ async def validate_measurements_across_drawings(
 ):
     """Validate measurements across multiple drawings."""
     try:
-        processor = PDFProcessor()
+        processor = pdf_processor
         
         if not processor.reference_analyzer or not processor.enhanced_measurement:
             raise HTTPException(
@@ -202,7 +200,7 @@ async def validate_measurements_across_drawings(
         
         for drawing_id in drawing_ids:
             # Get drawing
-            drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
+            drawing = db.query(Drawing).options(lazyload("*")).filter(Drawing.id == drawing_id).first()
             if not drawing:
                 continue
             
@@ -259,7 +257,7 @@ async def batch_enhanced_analysis_project(project_id: int, analysis_request: dic
             raise HTTPException(status_code=400, detail="No drawing IDs provided")
         
         drawings = _get_drawings_for_analysis(project_id, drawing_ids, db)
-        processor = _initialize_processor()
+        processor = pdf_processor
         processing_results = _process_drawings_batch(drawings, project_id, processor)
         
         return _create_batch_response(
@@ -275,7 +273,7 @@ async def batch_enhanced_analysis_project(project_id: int, analysis_request: dic
 
 def _get_drawings_for_analysis(project_id: int, drawing_ids: List[int], db: Session) -> List[Drawing]:
     """Get drawings for batch analysis with validation."""
-    drawings = db.query(Drawing).filter(
+    drawings = db.query(Drawing).options(lazyload("*")).filter(
         Drawing.id.in_(drawing_ids),
         Drawing.project_id == project_id
     ).all()
@@ -285,14 +283,6 @@ def _get_drawings_for_analysis(project_id: int, drawing_ids: List[int], db: Sess
     
     return drawings
 
-def _initialize_processor() -> PDFProcessor:
-    """Initialize PDF processor with error handling."""
-    try:
-        return PDFProcessor()
-    except Exception as e:
-        logger.error(f"Failed to initialize PDF processor: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to initialize processor: {str(e)}")
-
 def _process_drawings_batch(drawings: List[Drawing], project_id: int, processor: PDFProcessor) -> List[Dict]:
     """Process all drawings in batch with progress tracking."""
     processing_results = []
@@ -4,6 +4,7 @@ from typing import List
 
 from ..core.database import get_db
 from ..models.models import Material
+from ..models.material_cache import get_material as get_cached_material
 from ..models.schemas import MaterialCreate, MaterialUpdate, Material as MaterialSchema
 
 router = APIRouter()
@@ -33,7 +34,7 @@ async def get_material(
 ):
     """Get a specific material by ID"""
     try:
-        material = db.query(Material).filter(Material.id == material_id).first()
+        material = get_cached_material(material_id)
         if not material:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
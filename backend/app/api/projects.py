@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload, raiseload, selectinload
 from typing import List
 
 from ..core.database import get_db
@@ -8,6 +8,9 @@ from ..models.schemas import ProjectCreate, ProjectUpdate, Project as ProjectSch
 
 router = APIRouter()
 
+# Refreshing only the columns skips the selectin loads of every drawing and element
+_PROJECT_COLUMNS = Project.__table__.columns.keys()
+
 
 @router.post("/", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
 async def create_project(
@@ -19,7 +22,7 @@ async def create_project(
         db_project = Project(**project.dict())
         db.add(db_project)
         db.commit()
-        db.refresh(db_project)
+        db.refresh(db_project, attribute_names=_PROJECT_COLUMNS)
         return db_project
     except Exception as e:
         db.rollback()
@@ -37,7 +40,8 @@ async def get_projects(
 ):
     """Get all projects with pagination"""
     try:
-        projects = db.query(Project).offset(skip).limit(limit).all()
+        # The list schema has no child collections; skip the eager loads
+        projects = db.query(Project).options(raiseload("*")).offset(skip).limit(limit).all()
         return projects
     except Exception as e:
         raise HTTPException(
@@ -53,7 +57,7 @@ async def get_project(
 ):
     """Get a specific project by ID"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -77,7 +81,7 @@ async def update_project(
 ):
     """Update a project"""
     try:
-        db_project = db.query(Project).filter(Project.id == project_id).first()
+        db_project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not db_project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -90,7 +94,7 @@ async def update_project(
             setattr(db_project, field, value)
         
         db.commit()
-        db.refresh(db_project)
+        db.refresh(db_project, attribute_names=_PROJECT_COLUMNS)
         return db_project
     except HTTPException:
         raise
@@ -109,7 +113,7 @@ async def delete_project(
 ):
     """Delete a project"""
     try:
-        db_project = db.query(Project).filter(Project.id == project_id).first()
+        db_project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not db_project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -136,16 +140,20 @@ async def get_project_summary(
 ):
     """Get project summary with basic statistics"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(
+            selectinload(Project.drawings).lazyload("*"),
+            selectinload(Project.reports),
+            lazyload(Project.elements),
+        ).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found"
             )
         
-        # Count related entities
+        # Count related entities; elements are pre-aggregated on the project row
         drawing_count = len(project.drawings)
-        element_count = len(project.elements)
+        element_count = project.element_count
         report_count = len(project.reports)
         
         return {
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 
 from ..core.database import get_db
 from ..models.models import Project, Report
@@ -18,7 +18,7 @@ async def generate_cost_report(
 ):
     """Generate a cost report for a project"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -37,7 +37,7 @@ async def generate_cost_report(
             report_type=report_type,
             total_cost=summary.total_cost,
             total_carbon=summary.total_carbon,
-            summary_data=str(detailed_report)
+            summary_data=detailed_report
         )
         
         db.add(report)
@@ -62,7 +62,7 @@ async def get_project_reports(
 ):
     """Get all reports for a project"""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = db.query(Project).options(lazyload("*")).filter(Project.id == project_id).first()
         if not project:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,49 +1,84 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+from sqlalchemy.orm import Session, lazyload
+from typing import Dict, List, Optional, Tuple
 import logging
+import threading
+import time
 from ..core.database import get_db
+from ..models.models import Drawing
 from ..models.schemas import SteelSection, SteelSectionCreate, SteelElement, SteelElementCreate
 from ..services.steel_database import SteelDatabaseService
 from pathlib import Path
 import shutil
 import os
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["steel"])
 
+# drawing_id -> (expires_at, project_id, filename); the same drawing is
+# often re-detected many times during a workflow
+_DRAWING_CACHE_TTL = 60.0
+_DRAWING_CACHE_MAX = 1024
+_drawing_cache: Dict[int, Tuple[float, int, str]] = {}
+_drawing_cache_lock = threading.Lock()
+
+
+def _get_drawing_location(db: Session, drawing_id: int) -> Optional[Tuple[int, str]]:
+    """Get (project_id, filename) for a drawing, cached for a short TTL"""
+    now = time.monotonic()
+    hit = _drawing_cache.get(drawing_id)
+    if hit is not None and hit[0] > now:
+        return hit[1], hit[2]
+    
+    row = db.query(Drawing.project_id, Drawing.filename).filter(Drawing.id == drawing_id).first()
+    if row is None:
+        _drawing_cache.pop(drawing_id, None)
+        return None
+    
+    with _drawing_cache_lock:
+        if drawing_id not in _drawing_cache and len(_drawing_cache) >= _DRAWING_CACHE_MAX:
+            # Evict the oldest entry (dicts keep insertion order); sync routes
+            # run on threadpool threads, so another may have just taken it
+            _drawing_cache.pop(next(iter(_drawing_cache), None), None)
+        _drawing_cache[drawing_id] = (now + _DRAWING_CACHE_TTL, row.project_id, row.filename)
+    return row.project_id, row.filename
+
 @router.post("/sections/", response_model=SteelSection)
-def create_steel_section(section: SteelSectionCreate, db: Session = Depends(get_db)):
+def create_steel_section(section: SteelSectionCreate):
     """Create a new steel section"""
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     return steel_service.add_steel_section(section)
 
 @router.get("/sections/", response_model=List[SteelSection])
-def get_all_steel_sections(db: Session = Depends(get_db)):
+def get_all_steel_sections():
     """Get all steel sections"""
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     return steel_service.get_all_steel_sections()
 
 @router.get("/sections/search/", response_model=List[SteelSection])
-def search_steel_sections(query: str, db: Session = Depends(get_db)):
+def search_steel_sections(query: str):
     """Search steel sections"""
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     return steel_service.search_steel_sections(query)
 
 @router.get("/sections/{section_name}", response_model=SteelSection)
-def get_steel_section(section_name: str, db: Session = Depends(get_db)):
+def get_steel_section(section_name: str):
     """Get steel section by name"""
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     section = steel_service.get_steel_section(section_name)
     if not section:
         raise HTTPException(status_code=404, detail="Steel section not found")
     return section
 
 @router.post("/import-database/")
-def import_steel_database(file: UploadFile = File(...), db: Session = Depends(get_db)):
+def import_steel_database(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
     """Import British Steel UK sections database from PDF"""
-    if not file.filename.lower().endswith('.pdf'):
+    # Sniff the PDF magic bytes rather than trusting the filename
+    head = file.file.read(5)
+    file.file.seek(0)
+    if head != b"%PDF-":
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     # Create uploads directory if it doesn't exist
@@ -56,34 +91,34 @@ def import_steel_database(file: UploadFile = File(...), db: Session = Depends(ge
         shutil.copyfileobj(file.file, buffer)
     
     # Import British Steel database
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     result = steel_service.import_british_steel_database_from_pdf(str(file_path))
     
-    # Clean up uploaded file
-    os.remove(file_path)
-    
-    if result["success"]:
-        return result
-    else:
+    if not result["success"]:
+        # Background tasks are not run for error responses, so clean up now
+        os.remove(file_path)
         raise HTTPException(status_code=400, detail=result["message"])
+    
+    # Clean up uploaded file after the response has been sent
+    background_tasks.add_task(os.remove, file_path)
+    return result
 
 @router.post("/detect-elements/{drawing_id}")
 def detect_steel_elements(drawing_id: int, db: Session = Depends(get_db)):
     """Detect steel elements in a drawing"""
-    from ..models.models import Drawing
-    
     # Get drawing
-    drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
-    if not drawing:
+    location = _get_drawing_location(db, drawing_id)
+    if not location:
         raise HTTPException(status_code=404, detail="Drawing not found")
     
     # Get drawing file path
-    drawing_path = f"uploads/{drawing.project_id}/{drawing.filename}"
+    project_id, filename = location
+    drawing_path = f"uploads/{project_id}/{filename}"
     if not os.path.exists(drawing_path):
         raise HTTPException(status_code=404, detail="Drawing file not found")
     
     # Detect steel elements
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     steel_elements = steel_service.detect_steel_elements_in_drawing(drawing_path, drawing_id)
     
     return {
@@ -113,17 +148,18 @@ def get_steel_elements_for_drawing(drawing_id: int, db: Session = Depends(get_db
 @router.get("/elements/project/{project_id}")
 def get_steel_elements_for_project(project_id: int, db: Session = Depends(get_db)):
     """Get steel elements for a specific project"""
-    from ..models.models import SteelElement, Drawing
+    from ..models.models import SteelElement
     
     # Get all drawings for the project
-    drawings = db.query(Drawing).filter(Drawing.project_id == project_id).all()
+    drawings = db.query(Drawing).options(lazyload("*")).filter(Drawing.project_id == project_id).all()
     drawing_ids = [drawing.id for drawing in drawings]
     
     # Get steel elements for all drawings
     elements = db.query(SteelElement).filter(SteelElement.drawing_id.in_(drawing_ids)).all()
     
-    # Calculate totals
-    total_mass = sum(element.mass_kg or 0 for element in elements)
+    # Calculate totals (NULL masses become NaN and are skipped by nansum)
+    masses = np.fromiter((element.mass_kg for element in elements), dtype=np.float64, count=len(elements))
+    total_mass = float(np.nansum(masses))
     total_elements = len(elements)
     
     return {
@@ -146,9 +182,9 @@ def get_steel_elements_for_project(project_id: int, db: Session = Depends(get_db
     }
 
 @router.post("/calculate-mass/")
-def calculate_steel_mass(section_name: str, length_mm: float, db: Session = Depends(get_db)):
+def calculate_steel_mass(section_name: str, length_mm: float):
     """Calculate mass for a steel section"""
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     mass_kg = steel_service.calculate_steel_mass(section_name, length_mm)
     
     if mass_kg is None:
@@ -161,9 +197,9 @@ def calculate_steel_mass(section_name: str, length_mm: float, db: Session = Depe
     }
 
 @router.post("/detect-sections-in-text/")
-def detect_sections_in_text(text: str, db: Session = Depends(get_db)):
+def detect_sections_in_text(text: str):
     """Detect steel sections in text"""
-    steel_service = SteelDatabaseService(db)
+    steel_service = SteelDatabaseService()
     detected_sections = steel_service.detect_steel_sections_in_text(text)
     
     return {
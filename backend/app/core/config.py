@@ -21,24 +21,19 @@ class Settings(BaseSettings):
     # File upload settings
     upload_dir: str = "uploads"
     max_file_size: int = 50 * 1024 * 1024  # 50MB
-    allowed_file_types: list = [".pdf", ".png", ".jpg", ".jpeg", ".tiff"]
+    allowed_file_types: frozenset[str] = frozenset({".pdf", ".png", ".jpg", ".jpeg", ".tiff"})
     
     # ML model settings
     model_dir: str = "ml/models"
     confidence_threshold: float = 0.7
+    # Worker processes for PDFs of PARALLEL_PAGE_MIN_PAGES or more pages; 0 means one per CPU
+    pdf_page_workers: int = 0
+    # Directory for processed-drawing results keyed by file hash; empty disables
+    pdf_results_cache_dir: str = ""
     
     # API settings
-    cors_origins: list = [
-        "http://localhost:3000", 
-        "http://localhost:3001", 
-        "http://localhost:3002", 
-        "http://127.0.0.1:3000", 
-        "http://127.0.0.1:3001", 
-        "http://127.0.0.1:3002",
-        "http://localhost:3000/",
-        "http://127.0.0.1:3000/",
-        "*"  # Allow all origins for development
-    ]
+    # Local frontend dev servers; override via CORS_ORIGIN_REGEX (e.g. ".*")
+    cors_origin_regex: str = r"^http://(localhost|127\.0\.0\.1):(3000|3001|3002)$"
     
     class Config:
         env_file = ".env"
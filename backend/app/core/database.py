@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from .config import settings
 
 # Create database engine
@@ -9,6 +11,14 @@ if settings.database_url.startswith('sqlite'):
         settings.database_url,
         connect_args={"check_same_thread": False}
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers run alongside a writer; NORMAL only fsyncs at checkpoints
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
 else:
     engine = create_engine(
         settings.database_url,
@@ -22,9 +32,26 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+# Request-scoped session, bound by the db_session middleware in main.py
+current_session: ContextVar[Optional[Session]] = ContextVar("current_session", default=None)
+
+
+def get_current_session() -> Session:
+    """Return the session bound to the current request"""
+    db = current_session.get()
+    if db is None:
+        raise RuntimeError("No database session bound to the current request")
+    return db
+
 
 def get_db():
     """Dependency to get database session"""
+    db = current_session.get()
+    if db is not None:
+        # Reuse the request-scoped session; the middleware closes it
+        yield db
+        return
+
     db = SessionLocal()
     try:
         yield db
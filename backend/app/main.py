@@ -2,24 +2,42 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
+import atexit
 import logging
 import os
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
 
 from .core.config import settings
-from .core.database import engine, Base
+from .core.database import engine, Base, SessionLocal, current_session
+from .models.material_cache import preload_materials
 from .api import projects, drawings, elements, materials, analysis, reports, steel, concrete, enhanced_analysis, drawing_notes
 
-# Configure comprehensive logging
+# Configure comprehensive logging. Records are put on a queue and written
+# to file/console by a listener thread, so handler I/O never blocks the
+# event loop.
+log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+file_handler = logging.FileHandler("app.log")
+file_handler.setFormatter(log_formatter)
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter("%(message)s"))  # listener handlers add the full format
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+# force=True: ML modules imported above already call basicConfig
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler],
+    force=True
 )
+# Started alongside the handler, so anything importing the app (scripts,
+# TestClient outside a with-block) still gets its logs written out
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +51,9 @@ async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
         
+        # Warm the material lookup cache
+        logger.info("Cached %d materials", preload_materials())
+        
         # Ensure upload directory exists
         os.makedirs("uploads", exist_ok=True)
         logger.info("Upload directory ready")
@@ -55,19 +76,30 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Bind one database session per request so services and dependencies share it
+@app.middleware("http")
+async def db_session(request: Request, call_next):
+    token = current_session.set(SessionLocal())
+    try:
+        response = await call_next(request)
+    finally:
+        current_session.get().close()
+        current_session.reset(token)
+    return response
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
     response = await call_next(request)
     process_time = time.time() - start_time
-    logger.info(f"{request.method} {request.url.path} - {response.status_code} - {process_time:.3f}s")
+    logger.info("%s %s - %d - %.3fs", request.method, request.url.path, response.status_code, process_time)
     return response
 
 # Add CORS middleware with improved configuration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
@@ -108,30 +140,43 @@ async def root():
         "status": "running"
     }
 
+# Health probes arrive every few seconds from every load balancer; reuse the
+# last database check for a short window instead of taking a pool slot each time
+HEALTH_CACHE_SECONDS = 2.0
+_last_health_check: tuple = (0.0, {})
+
 @app.get("/health")
-async def health_check():
+def health_check():
     """Health check endpoint with detailed status"""
+    global _last_health_check
+    now = time.time()
+    if now - _last_health_check[0] < HEALTH_CACHE_SECONDS:
+        return _last_health_check[1]
+    
     try:
         # Test database connection
         from sqlalchemy import text
         with engine.connect() as conn:
             conn.execute(text("SELECT 1"))
         
-        return {
+        result = {
             "status": "healthy",
             "version": settings.app_version,
             "database": "connected",
-            "timestamp": time.time()
+            "timestamp": now
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return {
+        result = {
             "status": "unhealthy",
             "version": settings.app_version,
             "database": "disconnected",
             "error": str(e),
-            "timestamp": time.time()
+            "timestamp": now
         }
+    
+    _last_health_check = (now, result)
+    return result
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
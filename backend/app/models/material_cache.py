@@ -0,0 +1,85 @@
+"""
+In-process cache for the Material lookup table
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from .models import Material
+
+logger = logging.getLogger(__name__)
+
+_MATERIAL_CACHE_MAX = 1024
+# material_id -> detached Material (or None for ids that don't exist)
+_materials: Dict[int, Optional[Material]] = {}
+# Lookups run on threadpool and background-task threads
+_materials_lock = threading.Lock()
+
+
+def get_material(material_id: int) -> Optional[Material]:
+    """Return a material by id, querying the database only on a cache miss.
+
+    Cached instances are detached from any session, so only their column
+    attributes are available.
+    """
+    if material_id in _materials:
+        return _materials[material_id]
+
+    db = SessionLocal()
+    try:
+        material = db.get(Material, material_id)
+        if material is not None:
+            db.expunge(material)
+    finally:
+        db.close()
+
+    _remember(material_id, material)
+    return material
+
+
+def _remember(material_id: int, material: Optional[Material]) -> None:
+    with _materials_lock:
+        if len(_materials) >= _MATERIAL_CACHE_MAX:
+            _materials.pop(next(iter(_materials), None), None)
+        _materials[material_id] = material
+
+
+def preload_materials() -> int:
+    """Load the materials table into the cache with a single query"""
+    db = SessionLocal()
+    try:
+        materials = db.query(Material).limit(_MATERIAL_CACHE_MAX).all()
+        db.expunge_all()
+    finally:
+        db.close()
+
+    _materials.clear()
+    _materials.update((material.id, material) for material in materials)
+    return len(materials)
+
+
+def clear_material_cache() -> None:
+    """Drop every cached material"""
+    _materials.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_material_writes(session, flush_context):
+    # ORM flushes only; bulk UPDATE/DELETE statements must call clear_material_cache()
+    if any(isinstance(obj, Material) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["materials_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_material_cache(session):
+    # Cleared once the writes are committed (or discarded) rather than at
+    # flush: lookups use their own session, so one made between flush and
+    # commit would otherwise cache the old row again
+    if session.info.pop("materials_changed", False):
+        clear_material_cache()
@@ -1,13 +1,43 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, Numeric, DateTime, Text, ForeignKey, Boolean, JSON, Index, CheckConstraint, insert, text, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
-from datetime import datetime
+from typing import Any, Dict, List
+
+# Exact storage for money and carbon figures; returned to Python as float
+Money = Numeric(14, 2, asdecimal=False)
+CarbonTotal = Numeric(14, 4, asdecimal=False)
+CarbonFactor = Numeric(12, 4, asdecimal=False)
+# JSON everywhere, stored as JSONB on PostgreSQL so it can be GIN-indexed
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class BulkCreateMixin:
+    """Adds a batched insert path for rows produced in bulk by detection"""
+
+    @classmethod
+    def bulk_create(cls, session, rows: List[Dict[str, Any]], returning: bool = True) -> list:
+        """Insert rows with a single executemany and return the new instances.
+
+        Pass returning=False when the caller doesn't need the rows back; the
+        INSERT then skips RETURNING and an empty list is returned. The caller
+        owns the transaction and commits once for the whole batch.
+        """
+        if not rows:
+            return []
+        if not returning:
+            session.execute(insert(cls), rows)
+            return []
+        return session.scalars(insert(cls).returning(cls), rows).all()
 
 
 class Project(Base):
     """Project model for storing construction project information"""
     __tablename__ = "projects"
+    __table_args__ = (
+        CheckConstraint("length(name) >= 1", name="name_nonempty"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -16,16 +46,20 @@ class Project(Base):
     project_type = Column(String(100))  # residential, commercial, etc.
     location = Column(String(255))
     total_area = Column(Float)  # in square meters
-    total_cost = Column(Float)
-    carbon_footprint = Column(Float)  # in kg CO2
+    total_cost = Column(Money)
+    carbon_footprint = Column(CarbonTotal)  # in kg CO2
     status = Column(String(50), default="draft")  # draft, processing, completed
+    # Element aggregates, maintained by the triggers on the elements table
+    element_count = Column(Integer, nullable=False, default=0, server_default="0")
+    computed_total_area = Column(Float, nullable=False, default=0.0, server_default="0")
+    computed_total_volume = Column(Float, nullable=False, default=0.0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    drawings = relationship("Drawing", back_populates="project")
-    elements = relationship("Element", back_populates="project")
-    reports = relationship("Report", back_populates="project")
+    drawings = relationship("Drawing", back_populates="project", lazy="selectin")
+    elements = relationship("Element", back_populates="project", lazy="selectin")
+    reports = relationship("Report", back_populates="project", lazy="selectin")
 
 
 class Drawing(Base):
@@ -33,7 +67,7 @@ class Drawing(Base):
     __tablename__ = "drawings"
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
     filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer)  # in bytes
@@ -45,44 +79,134 @@ class Drawing(Base):
     
     # Relationships
     project = relationship("Project", back_populates="drawings")
-    elements = relationship("Element", back_populates="drawing")
-    steel_elements = relationship("SteelElement", back_populates="drawing")
-    concrete_elements = relationship("ConcreteElement", back_populates="drawing")
+    elements = relationship("Element", back_populates="drawing", lazy="selectin")
+    steel_elements = relationship("SteelElement", back_populates="drawing", lazy="selectin")
+    concrete_elements = relationship("ConcreteElement", back_populates="drawing", lazy="selectin")
 
 
-class Element(Base):
+class Element(BulkCreateMixin, Base):
     """Building element model for storing detected construction elements"""
     __tablename__ = "elements"
+    __table_args__ = (
+        Index("ix_element_drawing_type", "drawing_id", "element_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
-    drawing_id = Column(Integer, ForeignKey("drawings.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    drawing_id = Column(Integer, ForeignKey("drawings.id"))  # leads ix_element_drawing_type
     element_type = Column(String(100), nullable=False)  # wall, floor, door, window, etc.
-    material_id = Column(Integer, ForeignKey("materials.id"))
+    material_id = Column(Integer, ForeignKey("materials.id"), index=True)
     quantity = Column(Float, nullable=False)
     unit = Column(String(20), nullable=False)  # m2, m3, units, etc.
     area = Column(Float)  # in square meters
     volume = Column(Float)  # in cubic meters
     confidence_score = Column(Float)  # ML model confidence
-    bounding_box = Column(Text)  # JSON string of coordinates
+    bounding_box = Column(JSONType)  # [x1, y1, x2, y2]
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     project = relationship("Project", back_populates="elements")
     drawing = relationship("Drawing", back_populates="elements")
-    material = relationship("Material", back_populates="elements")
+    material = relationship("Material", back_populates="elements", lazy="joined")
+
+
+# Columns needed to render schemas.ElementListItem; use with load_only()
+ELEMENT_LIST_COLUMNS = (
+    Element.id, Element.project_id, Element.drawing_id, Element.material_id,
+    Element.element_type, Element.quantity, Element.unit,
+    Element.area, Element.volume, Element.confidence_score,
+)
+
+
+# Keep Project.element_count / computed_total_* in step with the elements
+# table. Triggers rather than ORM events so bulk inserts are covered too.
+PROJECT_TOTALS_TRIGGERS = {
+    "sqlite": [
+        """
+        CREATE TRIGGER trg_elements_totals_insert AFTER INSERT ON elements
+        BEGIN
+            UPDATE projects SET element_count = element_count + 1,
+                computed_total_area = computed_total_area + COALESCE(NEW.area, 0),
+                computed_total_volume = computed_total_volume + COALESCE(NEW.volume, 0)
+            WHERE id = NEW.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_elements_totals_delete AFTER DELETE ON elements
+        BEGIN
+            UPDATE projects SET element_count = element_count - 1,
+                computed_total_area = computed_total_area - COALESCE(OLD.area, 0),
+                computed_total_volume = computed_total_volume - COALESCE(OLD.volume, 0)
+            WHERE id = OLD.project_id;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_elements_totals_update
+        AFTER UPDATE OF project_id, area, volume ON elements
+        BEGIN
+            UPDATE projects SET element_count = element_count - 1,
+                computed_total_area = computed_total_area - COALESCE(OLD.area, 0),
+                computed_total_volume = computed_total_volume - COALESCE(OLD.volume, 0)
+            WHERE id = OLD.project_id;
+            UPDATE projects SET element_count = element_count + 1,
+                computed_total_area = computed_total_area + COALESCE(NEW.area, 0),
+                computed_total_volume = computed_total_volume + COALESCE(NEW.volume, 0)
+            WHERE id = NEW.project_id;
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION elements_project_totals() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE projects SET element_count = element_count - 1,
+                    computed_total_area = computed_total_area - COALESCE(OLD.area, 0),
+                    computed_total_volume = computed_total_volume - COALESCE(OLD.volume, 0)
+                WHERE id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE projects SET element_count = element_count + 1,
+                    computed_total_area = computed_total_area + COALESCE(NEW.area, 0),
+                    computed_total_volume = computed_total_volume + COALESCE(NEW.volume, 0)
+                WHERE id = NEW.project_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER trg_elements_project_totals
+        AFTER INSERT OR DELETE OR UPDATE OF project_id, area, volume ON elements
+        FOR EACH ROW EXECUTE FUNCTION elements_project_totals()
+        """,
+    ],
+}
+
+for _dialect, _statements in PROJECT_TOTALS_TRIGGERS.items():
+    for _statement in _statements:
+        event.listen(Element.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
 
 
 class Material(Base):
     """Material model for storing construction materials and their properties"""
     __tablename__ = "materials"
+    # SQLite matches partial-index predicates textually; the ORM emits `is_active = 1`
+    __table_args__ = (
+        Index(
+            "ix_material_active_category", "category",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active = 1"),
+        ),
+        CheckConstraint("length(name) >= 1", name="name_nonempty"),
+        CheckConstraint("unit_cost > 0", name="unit_cost_positive"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, unique=True)
     category = Column(String(100))  # concrete, steel, timber, etc.
-    unit_cost = Column(Float, nullable=False)  # cost per unit
+    unit_cost = Column(Money, nullable=False)  # cost per unit
     unit = Column(String(20), nullable=False)  # m2, m3, kg, etc.
-    carbon_factor = Column(Float)  # kg CO2 per unit
+    carbon_factor = Column(CarbonFactor)  # kg CO2 per unit
     density = Column(Float)  # kg/m3
     description = Column(Text)
     is_active = Column(Boolean, default=True)
@@ -96,15 +220,22 @@ class Material(Base):
 class Report(Base):
     """Report model for storing generated quantity survey reports"""
     __tablename__ = "reports"
+    __table_args__ = (
+        # Containment lookups (summary_data @> '{...}') on PostgreSQL
+        Index(
+            "ix_report_summary_gin", "summary_data",
+            postgresql_using="gin", postgresql_ops={"summary_data": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
     report_type = Column(String(50), nullable=False)  # boq, cost_summary, carbon_analysis
     filename = Column(String(255))
     file_path = Column(String(500))
-    total_cost = Column(Float)
-    total_carbon = Column(Float)
-    summary_data = Column(Text)  # JSON string of summary statistics
+    total_cost = Column(Money)
+    total_carbon = Column(CarbonTotal)
+    summary_data = Column(JSONType)  # summary statistics
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -114,12 +245,19 @@ class Report(Base):
 class CostDatabase(Base):
     """Cost database model for storing regional cost data"""
     __tablename__ = "cost_database"
+    __table_args__ = (
+        Index("ix_cost_region_year_material", "region", "year", "material_id"),
+        Index(
+            "ix_cost_active_region_material", "region", "material_id",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active = 1"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    region = Column(String(100), nullable=False)
-    material_id = Column(Integer, ForeignKey("materials.id"))
-    labor_cost = Column(Float)  # labor cost per unit
-    equipment_cost = Column(Float)  # equipment cost per unit
+    region = Column(String(100), nullable=False)  # leads ix_cost_region_year_material
+    material_id = Column(Integer, ForeignKey("materials.id"), index=True)
+    labor_cost = Column(Money)  # labor cost per unit
+    equipment_cost = Column(Money)  # equipment cost per unit
     overhead_percentage = Column(Float)  # overhead as percentage
     year = Column(Integer, nullable=False)
     source = Column(String(255))  # data source
@@ -144,36 +282,39 @@ class SteelSection(Base):
     area_mm2 = Column(Float)  # Cross-sectional area in mm²
     inertia_mm4 = Column(Float)  # Moment of inertia in mm⁴
     description = Column(String)  # Additional description
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-class SteelElement(Base):
+class SteelElement(BulkCreateMixin, Base):
     """Detected steel elements with mass calculations"""
     __tablename__ = "steel_elements"
+    __table_args__ = (
+        Index("ix_steel_drawing_section", "drawing_id", "section_name"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    drawing_id = Column(Integer, ForeignKey("drawings.id"), nullable=False)
+    drawing_id = Column(Integer, ForeignKey("drawings.id"), nullable=False)  # leads ix_steel_drawing_section
     element_type = Column(String, nullable=False)  # e.g., "beam", "column", "truss"
     section_name = Column(String, nullable=False)  # e.g., "W310x52"
     section_type = Column(String, nullable=False)  # e.g., "W", "H", "I"
     length_mm = Column(Float)  # Length in mm
     mass_kg = Column(Float)  # Calculated mass in kg
     confidence_score = Column(Float, default=0.0)
-    bbox = Column(String)  # JSON string of bounding box
-    text_references = Column(String)  # JSON string of associated text
-    properties = Column(String)  # JSON string of additional properties
-    created_at = Column(DateTime, default=datetime.utcnow)
+    bbox = Column(JSONType)  # [x1, y1, x2, y2]
+    text_references = Column(JSONType)  # associated text snippets
+    properties = Column(JSONType)  # additional properties
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationship
     drawing = relationship("Drawing", back_populates="steel_elements")
 
 
-class ConcreteElement(Base):
+class ConcreteElement(BulkCreateMixin, Base):
     """Detected concrete elements with volume measurements"""
     __tablename__ = "concrete_elements"
     
     id = Column(Integer, primary_key=True, index=True)
-    drawing_id = Column(Integer, ForeignKey("drawings.id"), nullable=False)
+    drawing_id = Column(Integer, ForeignKey("drawings.id"), nullable=False, index=True)
     element_type = Column(String, nullable=False)  # foundation, slab, wall, column, beam, etc.
     concrete_grade = Column(String, nullable=False, default="C25")  # C25, C30, C40, etc.
     length_m = Column(Float, nullable=False)  # Length in meters
@@ -183,10 +324,10 @@ class ConcreteElement(Base):
     confidence_score = Column(Float, default=0.0)
     location = Column(String)  # Optional location description
     description = Column(Text)  # Additional description
-    text_references = Column(String)  # JSON string of associated text
-    bbox = Column(String)  # JSON string of bounding box
-    properties = Column(String)  # JSON string of additional properties
-    created_at = Column(DateTime, default=datetime.utcnow)
+    text_references = Column(JSONType)  # associated text snippets
+    bbox = Column(JSONType)  # [x1, y1, x2, y2]
+    properties = Column(JSONType)  # additional properties
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationship
     drawing = relationship("Drawing", back_populates="concrete_elements") 
\ No newline at end of file
@@ -1,11 +1,14 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, model_validator
+from typing import Annotated, Any, Dict, Optional, List, Tuple
 from datetime import datetime
 
+# Mirrors the String(255) name columns and their name_nonempty CHECK constraints
+Name = Annotated[str, StringConstraints(min_length=1, max_length=255)]
+
 
 # Project schemas
 class ProjectBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=255)
+    name: Name
     description: Optional[str] = None
     client_name: Optional[str] = None
     project_type: Optional[str] = None
@@ -18,7 +21,7 @@ class ProjectCreate(ProjectBase):
 
 
 class ProjectUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    name: Optional[Name] = None
     description: Optional[str] = None
     client_name: Optional[str] = None
     project_type: Optional[str] = None
@@ -32,11 +35,13 @@ class Project(ProjectBase):
     total_cost: Optional[float] = None
     carbon_footprint: Optional[float] = None
     status: str
+    element_count: int = 0
+    computed_total_area: float = 0.0
+    computed_total_volume: float = 0.0
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Drawing schemas
@@ -60,12 +65,11 @@ class Drawing(DrawingBase):
     processing_status: str
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DrawingWithElements(Drawing):
-    elements: Optional[List['Element']] = None
+    elements: Optional[List['ElementListItem']] = None
 
 
 # Element schemas
@@ -76,7 +80,7 @@ class ElementBase(BaseModel):
     area: Optional[float] = None
     volume: Optional[float] = None
     confidence_score: Optional[float] = None
-    bounding_box: Optional[str] = None
+    bounding_box: Optional[List[float]] = None
 
 
 class ElementCreate(ElementBase):
@@ -92,13 +96,28 @@ class Element(ElementBase):
     material_id: Optional[int] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ElementListItem(BaseModel):
+    """Element as shown in list views, without the bounding box payload"""
+    id: int
+    project_id: Optional[int] = None
+    drawing_id: Optional[int] = None
+    material_id: Optional[int] = None
+    element_type: str
+    quantity: float
+    unit: str
+    area: Optional[float] = None
+    volume: Optional[float] = None
+    confidence_score: Optional[float] = None
+    
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Material schemas
 class MaterialBase(BaseModel):
-    name: str = Field(..., min_length=1, max_length=255)
+    name: Name
     category: Optional[str] = None
     unit_cost: float = Field(..., gt=0)
     unit: str
@@ -112,7 +131,7 @@ class MaterialCreate(MaterialBase):
 
 
 class MaterialUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    name: Optional[Name] = None
     category: Optional[str] = None
     unit_cost: Optional[float] = Field(None, gt=0)
     unit: Optional[str] = None
@@ -128,8 +147,7 @@ class Material(MaterialBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Report schemas
@@ -137,7 +155,7 @@ class ReportBase(BaseModel):
     report_type: str
     total_cost: Optional[float] = None
     total_carbon: Optional[float] = None
-    summary_data: Optional[str] = None
+    summary_data: Optional[Dict[str, Any]] = None
 
 
 class ReportCreate(ReportBase):
@@ -151,8 +169,7 @@ class Report(ReportBase):
     file_path: Optional[str] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Cost Database schemas
@@ -175,15 +192,14 @@ class CostDatabase(CostDatabaseBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Analysis schemas
 class ElementDetectionResult(BaseModel):
     element_type: str
     confidence: float
-    bounding_box: List[float]
+    bounding_box: Tuple[float, float, float, float]  # xmin, ymin, xmax, ymax
     area: Optional[float] = None
     volume: Optional[float] = None
     suggested_material: Optional[str] = None
@@ -196,6 +212,46 @@ class DrawingAnalysisResult(BaseModel):
     status: str
 
 
+class DrawingAnalysisResultBatch(BaseModel):
+    """Column-oriented DrawingAnalysisResult: one list per field, index i is detection i.
+
+    Each list converts to a NumPy array in one call, so box maths (IoU, NMS)
+    can run vectorised without walking per-detection objects.
+    """
+    drawing_id: int
+    processing_time: float
+    status: str
+    element_type: List[str] = []
+    confidence: List[float] = []
+    xmin: List[float] = []
+    ymin: List[float] = []
+    xmax: List[float] = []
+    ymax: List[float] = []
+
+    @model_validator(mode="after")
+    def _check_lengths(self):
+        n = len(self.element_type)
+        if any(len(column) != n for column in (self.confidence, self.xmin, self.ymin, self.xmax, self.ymax)):
+            raise ValueError("all detection columns must have the same length")
+        return self
+
+    @classmethod
+    def from_result(cls, result: DrawingAnalysisResult) -> "DrawingAnalysisResultBatch":
+        detections = result.elements_detected
+        xmin, ymin, xmax, ymax = zip(*(d.bounding_box for d in detections)) if detections else ((), (), (), ())
+        return cls(
+            drawing_id=result.drawing_id,
+            processing_time=result.processing_time,
+            status=result.status,
+            element_type=[d.element_type for d in detections],
+            confidence=[d.confidence for d in detections],
+            xmin=list(xmin),
+            ymin=list(ymin),
+            xmax=list(xmax),
+            ymax=list(ymax),
+        )
+
+
 class CostCalculationResult(BaseModel):
     element_id: int
     material_cost: float
@@ -249,8 +305,7 @@ class SteelSection(SteelSectionBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SteelElementBase(BaseModel):
     element_type: str
@@ -259,9 +314,9 @@ class SteelElementBase(BaseModel):
     length_mm: Optional[float] = None
     mass_kg: Optional[float] = None
     confidence_score: float = 0.0
-    bbox: Optional[str] = None
-    text_references: Optional[str] = None
-    properties: Optional[str] = None
+    bbox: Optional[List[float]] = None
+    text_references: Optional[List[str]] = None
+    properties: Optional[Dict[str, Any]] = None
 
 class SteelElementCreate(SteelElementBase):
     drawing_id: int
@@ -271,5 +326,4 @@ class SteelElement(SteelElementBase):
     drawing_id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
@@ -10,15 +10,47 @@ import cv2
 import numpy as np
 import fitz  # PyMuPDF
 import logging
+import math
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterator, List, Dict, Any, Optional, Sequence, Tuple
 import json
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Fewer pages than this are cheaper to read inline than to hand to worker processes
+PARALLEL_TEXT_MIN_PAGES = 16
+TEXT_EXTRACTION_WORKERS = min(os.cpu_count() or 1, 4)
+MIN_BLOCK_LENGTH = 5
+# OpenCV releases the GIL, so threads are enough for per-image detection
+IMAGE_DETECTION_WORKERS = 8
+# Longest side, in pixels, that contours are traced at
+MAX_CONTOUR_IMAGE_SIZE = 2000
+
+# Dimension keys to fall back through, in priority order
+_LENGTH_KEYS = ('length', 'width')
+_WIDTH_KEYS = ('width', 'length')
+_DEPTH_KEYS = ('depth', 'thickness', 'height')
+
+
+def _pick(dimensions: Dict[str, float], keys: Tuple[str, ...], default: float) -> float:
+    """First of keys present in dimensions, else default"""
+    for key in keys:
+        value = dimensions.get(key)
+        if value is not None:
+            return value
+    return default
+
+
+def _extract_page_range_text(pdf_path: str, start: int, stop: int) -> str:
+    """Worker: text of pages [start, stop) using the worker's own document handle"""
+    with fitz.open(pdf_path) as doc:
+        return "".join(doc[page_num].get_text() for page_num in range(start, stop))
+
+@dataclass(slots=True)
 class ConcreteDimension:
     """Represents a concrete element with 3D dimensions"""
     length: float  # in meters
@@ -28,7 +60,7 @@ class ConcreteDimension:
     confidence: float
     text_reference: str
 
-@dataclass
+@dataclass(slots=True)
 class ConcreteElement:
     """Represents a detected concrete element"""
     element_type: str  # foundation, slab, wall, column, beam, etc.
@@ -38,6 +70,39 @@ class ConcreteElement:
     location: Optional[str] = None
     description: Optional[str] = None
 
+@dataclass(slots=True)
+class ConcreteBatch:
+    """Column-wise concrete elements of one grade, as produced by geometric detection"""
+    element_type: np.ndarray  # str per element
+    length: np.ndarray        # in meters
+    width: np.ndarray         # in meters
+    depth: np.ndarray         # in meters
+    volume: np.ndarray        # in cubic meters
+    confidence: np.ndarray
+    text_reference: str
+    grade: str = "C25"
+
+    def __len__(self) -> int:
+        return len(self.volume)
+
+    def element(self, i: int) -> ConcreteElement:
+        """Materialise the i-th element"""
+        return ConcreteElement(
+            element_type=str(self.element_type[i]),
+            dimensions=ConcreteDimension(
+                length=float(self.length[i]),
+                width=float(self.width[i]),
+                depth=float(self.depth[i]),
+                volume=float(self.volume[i]),
+                confidence=float(self.confidence[i]),
+                text_reference=self.text_reference
+            ),
+            grade=self.grade
+        )
+
+    def to_elements(self) -> List[ConcreteElement]:
+        return [self.element(i) for i in range(len(self))]
+
 class ConcreteProcessor:
     """Processes drawings to detect and measure concrete elements"""
     
@@ -45,29 +110,29 @@ class ConcreteProcessor:
         self.dimension_patterns = {
             # Common dimension patterns in construction drawings
             'thickness': [
-                r'(\d+(?:\.\d+)?)\s*(?:mm|m)\s*(?:thick|thickness|t\.?)',
-                r'thickness[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
-                r't[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
+                r'(\d+(?:\.\d+)?)\s*(mm|m)\s*(?:thick|thickness|t\.?)',
+                r'thickness[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
+                r't[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
             ],
             'depth': [
-                r'(\d+(?:\.\d+)?)\s*(?:mm|m)\s*(?:deep|depth|d\.?)',
-                r'depth[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
-                r'd[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
+                r'(\d+(?:\.\d+)?)\s*(mm|m)\s*(?:deep|depth|d\.?)',
+                r'depth[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
+                r'd[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
             ],
             'height': [
-                r'(\d+(?:\.\d+)?)\s*(?:mm|m)\s*(?:high|height|h\.?)',
-                r'height[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
-                r'h[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
+                r'(\d+(?:\.\d+)?)\s*(mm|m)\s*(?:high|height|h\.?)',
+                r'height[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
+                r'h[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
             ],
             'width': [
-                r'(\d+(?:\.\d+)?)\s*(?:mm|m)\s*(?:wide|width|w\.?)',
-                r'width[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
-                r'w[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
+                r'(\d+(?:\.\d+)?)\s*(mm|m)\s*(?:wide|width|w\.?)',
+                r'width[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
+                r'w[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
             ],
             'length': [
-                r'(\d+(?:\.\d+)?)\s*(?:mm|m)\s*(?:long|length|l\.?)',
-                r'length[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
-                r'l[:\s]*(\d+(?:\.\d+)?)\s*(?:mm|m)',
+                r'(\d+(?:\.\d+)?)\s*(mm|m)\s*(?:long|length|l\.?)',
+                r'length[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
+                r'l[:\s]*(\d+(?:\.\d+)?)\s*(mm|m)',
             ]
         }
         
@@ -118,29 +183,44 @@ class ConcreteProcessor:
             r'grade\s*(\d{2,3})',
             r'concrete\s*(\d{2,3})'
         ]
+        
+        # Compiled once here rather than looked up in re's cache per text block
+        self._dimension_res = {
+            dim_type: [re.compile(p, re.IGNORECASE) for p in patterns]
+            for dim_type, patterns in self.dimension_patterns.items()
+        }
+        # A pattern such as r'pad\s*foundation' can only match where the bare
+        # keyword 'foundation' of the same type also matches, so only the bare
+        # keywords need scanning. re can't literal-scan an alternation, so
+        # separate keyword searches beat one fused regex here.
+        self._concrete_res = {
+            element_type: [
+                re.compile(p, re.IGNORECASE) for p in patterns
+                if not any(k.isalpha() and k != p and k in p for k in patterns)
+            ]
+            for element_type, patterns in self.concrete_patterns.items()
+        }
+        self._grade_res = [re.compile(p, re.IGNORECASE) for p in self.grade_patterns]
+        self._block_finder = re.compile(r'[^.!?\n]+')
 
     def process_drawing_for_concrete(self, pdf_path: str) -> List[ConcreteElement]:
         """Process a drawing to detect concrete elements and their dimensions"""
         try:
-            # Extract text from PDF
-            extracted_text = self._extract_text_from_pdf(pdf_path)
-            
-            # Extract images from PDF for geometric detection
-            images = self._extract_images_from_pdf(pdf_path)
-            
-            concrete_elements = []
+            # Extract text, and images for geometric detection, in one pass over the PDF
+            extracted_text, images = self._extract_text_and_images(pdf_path)
             
             # Process text for dimension information
             text_elements = self._extract_concrete_from_text(extracted_text)
-            concrete_elements.extend(text_elements)
             
             # Process images for geometric detection
-            for image_path in images:
-                image_elements = self._detect_concrete_in_image(image_path)
-                concrete_elements.extend(image_elements)
+            if len(images) > 1:
+                with ThreadPoolExecutor(max_workers=min(IMAGE_DETECTION_WORKERS, len(images))) as pool:
+                    image_batches = list(pool.map(self._detect_concrete_in_image, images))
+            else:
+                image_batches = [self._detect_concrete_in_image(image) for image in images]
             
             # Merge and deduplicate elements
-            merged_elements = self._merge_concrete_elements(concrete_elements)
+            merged_elements = self._merge_concrete_elements(text_elements, image_batches)
             
             logger.info(f"Detected {len(merged_elements)} concrete elements")
             return merged_elements
@@ -149,62 +229,63 @@ class ConcreteProcessor:
             logger.error(f"Error processing drawing for concrete: {e}")
             return []
 
-    def _extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract all text from PDF"""
+    def _extract_text_and_images(self, pdf_path: str) -> Tuple[str, List[np.ndarray]]:
+        """Extract all text and the embedded images from a PDF, opening it once"""
         try:
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
+            with fitz.open(pdf_path) as doc:
+                page_count = len(doc)
+                if page_count < PARALLEL_TEXT_MIN_PAGES or TEXT_EXTRACTION_WORKERS < 2:
+                    text_parts = []
+                    images = []
+                    for page in doc:
+                        text_parts.append(page.get_text())
+                        images.extend(self._page_images(doc, page))
+                    return "".join(text_parts), images
+
+                # Workers read text from their own handles, one contiguous page
+                # range each, while this process pulls out the images. spawn
+                # avoids forking the server's threads and open document.
+                step = -(-page_count // TEXT_EXTRACTION_WORKERS)
+                starts = range(0, page_count, step)
+                with ProcessPoolExecutor(
+                    max_workers=TEXT_EXTRACTION_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+                ) as pool:
+                    parts = pool.map(
+                        _extract_page_range_text,
+                        [pdf_path] * len(starts),
+                        starts,
+                        [min(start + step, page_count) for start in starts],
+                    )
+                    images = [image for page in doc for image in self._page_images(doc, page)]
+                    return "".join(parts), images
         except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
-            return ""
+            logger.error(f"Error extracting text and images from PDF: {e}")
+            return "", []
 
-    def _extract_images_from_pdf(self, pdf_path: str) -> List[str]:
-        """Extract images from PDF for processing"""
-        try:
-            doc = fitz.open(pdf_path)
-            images = []
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                image_list = page.get_images()
-                
-                for img_index, img in enumerate(image_list):
-                    xref = img[0]
-                    pix = fitz.Pixmap(doc, xref)
-                    
-                    if pix.n - pix.alpha < 4:  # GRAY or RGB
-                        img_data = pix.tobytes("png")
-                        img_path = f"temp_page_{page_num}_img_{img_index}.png"
-                        
-                        with open(img_path, "wb") as f:
-                            f.write(img_data)
-                        images.append(img_path)
-                    
-                    pix = None
+    def _page_images(self, doc: fitz.Document, page: fitz.Page) -> List[np.ndarray]:
+        """Embedded images of a page as BGR (or single-channel gray) arrays"""
+        images = []
+        for img in page.get_images():
+            xref = img[0]
+            pix = fitz.Pixmap(doc, xref)
             
-            doc.close()
-            return images
+            if pix.n - pix.alpha < 4:  # GRAY or RGB
+                samples = np.frombuffer(pix.samples, dtype=np.uint8)
+                samples = samples.reshape(pix.height, pix.width, pix.n)
+                if pix.n - pix.alpha == 1:
+                    images.append(samples[:, :, 0])
+                else:
+                    # Alpha is dropped, as cv2.imread did for the old temp PNGs
+                    images.append(cv2.cvtColor(samples[:, :, :3], cv2.COLOR_RGB2BGR))
             
-        except Exception as e:
-            logger.error(f"Error extracting images from PDF: {e}")
-            return []
+            pix = None
+        return images
 
     def _extract_concrete_from_text(self, text: str) -> List[ConcreteElement]:
         """Extract concrete elements and dimensions from text"""
         elements = []
         
-        # Split text into sentences/paragraphs for processing
-        text_blocks = re.split(r'[.!?\n]+', text)
-        
-        for block in text_blocks:
-            block = block.strip()
-            if not block:
-                continue
-                
+        for block in self._iter_blocks(text):
             # Check for concrete element types
             element_type = self._identify_concrete_element_type(block)
             if not element_type:
@@ -230,13 +311,19 @@ class ConcreteProcessor:
         
         return elements
 
+    def _iter_blocks(self, text: str) -> Iterator[str]:
+        """Yield stripped sentences/paragraphs long enough to describe an element"""
+        for match in self._block_finder.finditer(text):
+            block = match.group().strip()
+            # Shorter than any element keyword plus a dimension
+            if len(block) >= MIN_BLOCK_LENGTH:
+                yield block
+
     def _identify_concrete_element_type(self, text: str) -> Optional[str]:
         """Identify concrete element type from text"""
-        text_lower = text.lower()
-        
-        for element_type, patterns in self.concrete_patterns.items():
+        for element_type, patterns in self._concrete_res.items():
             for pattern in patterns:
-                if re.search(pattern, text_lower):
+                if pattern.search(text):
                     return element_type
         
         return None
@@ -245,13 +332,13 @@ class ConcreteProcessor:
         """Extract 3D dimensions from text"""
         dimensions = {}
         
-        for dim_type, patterns in self.dimension_patterns.items():
+        for dim_type, patterns in self._dimension_res.items():
             for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+                match = pattern.search(text)
                 if match:
                     value = float(match.group(1))
                     # Convert mm to m if needed
-                    if 'mm' in text[match.start():match.start()+20]:
+                    if match.group(2) == 'mm':
                         value = value / 1000
                     dimensions[dim_type] = value
                     break
@@ -262,9 +349,9 @@ class ConcreteProcessor:
             
         # Calculate missing dimensions based on element type
         # For now, use reasonable defaults
-        length = dimensions.get('length', dimensions.get('width', 1.0))
-        width = dimensions.get('width', dimensions.get('length', 1.0))
-        depth = dimensions.get('depth', dimensions.get('thickness', dimensions.get('height', 0.2)))
+        length = _pick(dimensions, _LENGTH_KEYS, 1.0)
+        width = _pick(dimensions, _WIDTH_KEYS, 1.0)
+        depth = _pick(dimensions, _DEPTH_KEYS, 0.2)
         
         volume = length * width * depth
         
@@ -279,188 +366,182 @@ class ConcreteProcessor:
 
     def _extract_concrete_grade(self, text: str) -> str:
         """Extract concrete grade from text"""
-        text_lower = text.lower()
-        
-        for pattern in self.grade_patterns:
-            match = re.search(pattern, text_lower)
+        for pattern in self._grade_res:
+            match = pattern.search(text)
             if match:
                 return f"C{match.group(1)}"
         
         return "C25"  # Default grade
 
-    def _detect_concrete_in_image(self, image_path: str) -> List[ConcreteElement]:
-        """Detect concrete elements in image using computer vision"""
+    def _detect_concrete_in_image(self, image: np.ndarray) -> Optional[ConcreteBatch]:
+        """Detect concrete elements in a BGR or grayscale image using computer vision"""
         try:
-            image = cv2.imread(image_path)
-            if image is None:
-                return []
-            
             # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             
-            # Detect contours (potential concrete elements)
-            contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            # Contour work grows with pixel count, so trace large scans at a
+            # reduced size and scale the measurements back up. A whole-number
+            # factor keeps cv2.resize on its fast INTER_AREA path.
+            scale = -(-max(gray.shape) // MAX_CONTOUR_IMAGE_SIZE)
+            if scale > 1:
+                gray = cv2.resize(gray, None, fx=1 / scale, fy=1 / scale, interpolation=cv2.INTER_AREA)
             
-            elements = []
+            # Trace edges rather than raw intensity: findContours treats every
+            # non-zero pixel as foreground, so a white page would be one contour
+            edges = cv2.Canny(gray, 50, 150)
             
-            for contour in contours:
-                # Filter contours by size (remove noise)
-                area = cv2.contourArea(contour)
-                if area < 1000:  # Minimum area threshold
-                    continue
-                
-                # Get bounding rectangle
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Estimate dimensions (this is approximate)
-                # In a real system, you'd need scale information from the drawing
-                length = w / 100  # Approximate scale
-                width = h / 100   # Approximate scale
-                depth = 0.2       # Default depth for concrete elements
-                
-                volume = length * width * depth
-                
-                # Determine element type based on shape
-                aspect_ratio = w / h
-                if aspect_ratio > 5:
-                    element_type = "beam"
-                elif aspect_ratio < 0.2:
-                    element_type = "wall"
-                elif area > 50000:
-                    element_type = "slab"
-                else:
-                    element_type = "foundation"
-                
-                dimension = ConcreteDimension(
-                    length=length,
-                    width=width,
-                    depth=depth,
-                    volume=volume,
-                    confidence=0.6,  # Lower confidence for geometric detection
-                    text_reference="Geometric detection"
-                )
-                
-                element = ConcreteElement(
-                    element_type=element_type,
-                    dimensions=dimension,
-                    grade="C25"  # Default grade
-                )
-                
-                elements.append(element)
+            # Detect contours (potential concrete elements)
+            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
-            return elements
+            if not contours:
+                return None
+
+            # Filter contours by size (remove noise)
+            areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+            areas *= scale * scale
+            keep = areas >= 1000  # Minimum area threshold, in full-size pixels
+            if not keep.any():
+                return None
+            areas = areas[keep]
+            rects = np.array([cv2.boundingRect(c) for c, k in zip(contours, keep) if k], dtype=np.int64)
+            w, h = rects[:, 2] * scale, rects[:, 3] * scale
+
+            # Estimate dimensions (this is approximate)
+            # In a real system, you'd need scale information from the drawing
+            lengths = w / 100  # Approximate scale
+            widths = h / 100   # Approximate scale
+            depth = 0.2        # Default depth for concrete elements
+            volumes = lengths * widths * depth
+
+            # Determine element type based on shape
+            aspect_ratios = w / h
+            element_types = np.select(
+                [aspect_ratios > 5, aspect_ratios < 0.2, areas > 50000],
+                ["beam", "wall", "slab"],
+                default="foundation",
+            )
+
+            return ConcreteBatch(
+                element_type=element_types,
+                length=lengths,
+                width=widths,
+                depth=np.full(len(lengths), depth),
+                volume=volumes,
+                confidence=np.full(len(lengths), 0.6),  # Lower confidence for geometric detection
+                text_reference="Geometric detection",
+                grade="C25"  # Default grade
+            )
             
         except Exception as e:
             logger.error(f"Error detecting concrete in image: {e}")
-            return []
+            return None
 
-    def _merge_concrete_elements(self, elements: List[ConcreteElement]) -> List[ConcreteElement]:
-        """Merge and deduplicate concrete elements"""
-        if not elements:
-            return []
-        
-        # Group elements by type and similar dimensions
+    def _merge_concrete_elements(
+        self, elements: List[ConcreteElement], batches: Sequence[Optional[ConcreteBatch]] = ()
+    ) -> List[ConcreteElement]:
+        """Merge and deduplicate concrete elements, followed by any detected batches"""
+        # Accumulate [total volume, total confidence, count, template] per
+        # type/grade group instead of keeping every element
         grouped = {}
         
         for element in elements:
-            key = f"{element.element_type}_{element.grade}"
-            
-            if key not in grouped:
-                grouped[key] = []
-            
-            grouped[key].append(element)
+            key = (element.element_type, element.grade)
+            group = grouped.get(key)
+            if group is None:
+                # Use the first element as template
+                grouped[key] = [element.dimensions.volume, element.dimensions.confidence, 1, element]
+            else:
+                group[0] += element.dimensions.volume
+                group[1] += element.dimensions.confidence
+                group[2] += 1
+        
+        for batch in batches:
+            if batch:
+                self._accumulate_batch(grouped, batch)
         
         # Merge similar elements
         merged = []
         
-        for key, group in grouped.items():
-            if len(group) == 1:
-                merged.append(group[0])
-            else:
-                # Merge elements with similar dimensions
-                total_volume = sum(e.dimensions.volume for e in group)
-                avg_confidence = sum(e.dimensions.confidence for e in group) / len(group)
-                
-                # Use the first element as template
-                template = group[0]
-                merged_dimension = ConcreteDimension(
-                    length=template.dimensions.length,
-                    width=template.dimensions.width,
-                    depth=template.dimensions.depth,
-                    volume=total_volume,
-                    confidence=avg_confidence,
-                    text_reference=f"Merged {len(group)} elements"
-                )
-                
-                merged_element = ConcreteElement(
-                    element_type=template.element_type,
-                    dimensions=merged_dimension,
-                    grade=template.grade,
-                    description=f"Combined {len(group)} similar elements"
-                )
-                
-                merged.append(merged_element)
+        for total_volume, total_confidence, count, template in grouped.values():
+            if count == 1:
+                merged.append(template)
+                continue
+
+            merged_dimension = ConcreteDimension(
+                length=template.dimensions.length,
+                width=template.dimensions.width,
+                depth=template.dimensions.depth,
+                volume=total_volume,
+                confidence=total_confidence / count,
+                text_reference=f"Merged {count} elements"
+            )
+            
+            merged_element = ConcreteElement(
+                element_type=template.element_type,
+                dimensions=merged_dimension,
+                grade=template.grade,
+                description=f"Combined {count} similar elements"
+            )
+            
+            merged.append(merged_element)
         
         return merged
 
+    def _accumulate_batch(self, grouped: Dict[Tuple[str, str], list], batch: ConcreteBatch) -> None:
+        """Add a batch's per-type totals to the accumulators of _merge_concrete_elements"""
+        # Stable sort keeps each type's first element at the start of its run
+        order = np.argsort(batch.element_type, kind="stable")
+        sorted_types = batch.element_type[order]
+        starts = np.flatnonzero(np.r_[True, sorted_types[1:] != sorted_types[:-1]])
+        volumes = np.add.reduceat(batch.volume[order], starts)
+        confidences = np.add.reduceat(batch.confidence[order], starts)
+        counts = np.diff(np.r_[starts, len(order)])
+        first_indices = order[starts]
+        
+        # Visit types in order of first appearance, as an element loop would
+        for run in np.argsort(first_indices, kind="stable").tolist():
+            key = (str(sorted_types[starts[run]]), batch.grade)
+            group = grouped.get(key)
+            if group is None:
+                grouped[key] = [
+                    float(volumes[run]), float(confidences[run]), int(counts[run]),
+                    batch.element(int(first_indices[run])),
+                ]
+            else:
+                group[0] += float(volumes[run])
+                group[1] += float(confidences[run])
+                group[2] += int(counts[run])
+
     def calculate_total_concrete_volume(self, elements: List[ConcreteElement]) -> float:
         """Calculate total concrete volume in m³"""
-        return sum(element.dimensions.volume for element in elements)
+        # fsum keeps many small volumes correctly rounded
+        return math.fsum(element.dimensions.volume for element in elements)
 
     def generate_concrete_report(self, elements: List[ConcreteElement]) -> Dict[str, Any]:
         """Generate a comprehensive concrete measurement report"""
         if not elements:
             return {"error": "No concrete elements detected"}
         
-        # Group by element type
+        # Single pass: [count, volume] per type and per grade, plus the element list
         by_type = {}
-        for element in elements:
-            if element.element_type not in by_type:
-                by_type[element.element_type] = []
-            by_type[element.element_type].append(element)
-        
-        # Calculate totals
-        total_volume = self.calculate_total_concrete_volume(elements)
-        
-        # Calculate by grade
         by_grade = {}
-        for element in elements:
-            if element.grade not in by_grade:
-                by_grade[element.grade] = []
-            by_grade[element.grade].append(element)
-        
-        report = {
-            "total_volume_m3": total_volume,
-            "element_count": len(elements),
-            "by_type": {},
-            "by_grade": {},
-            "elements": []
-        }
-        
-        # Add breakdown by type
-        for element_type, type_elements in by_type.items():
-            volume = sum(e.dimensions.volume for e in type_elements)
-            report["by_type"][element_type] = {
-                "count": len(type_elements),
-                "volume_m3": volume,
-                "percentage": (volume / total_volume) * 100
-            }
-        
-        # Add breakdown by grade
-        for grade, grade_elements in by_grade.items():
-            volume = sum(e.dimensions.volume for e in grade_elements)
-            report["by_grade"][grade] = {
-                "count": len(grade_elements),
-                "volume_m3": volume,
-                "percentage": (volume / total_volume) * 100
-            }
+        element_rows = []
         
-        # Add detailed element list
         for element in elements:
-            report["elements"].append({
+            volume = element.dimensions.volume
+            
+            type_totals = by_type.setdefault(element.element_type, [0, 0.0])
+            type_totals[0] += 1
+            type_totals[1] += volume
+            
+            grade_totals = by_grade.setdefault(element.grade, [0, 0.0])
+            grade_totals[0] += 1
+            grade_totals[1] += volume
+            
+            element_rows.append({
                 "type": element.element_type,
                 "grade": element.grade,
-                "volume_m3": element.dimensions.volume,
+                "volume_m3": volume,
                 "dimensions": {
                     "length_m": element.dimensions.length,
                     "width_m": element.dimensions.width,
@@ -470,4 +551,31 @@ class ConcreteProcessor:
                 "description": element.description
             })
         
+        total_volume = math.fsum(row["volume_m3"] for row in element_rows)
+        
+        # Zero-volume elements (e.g. missing dimensions) must not divide by zero
+        percent_of_total = 100.0 / total_volume if total_volume else 0.0
+        
+        report = {
+            "total_volume_m3": total_volume,
+            "element_count": len(elements),
+            "by_type": {
+                element_type: {
+                    "count": count,
+                    "volume_m3": volume,
+                    "percentage": volume * percent_of_total
+                }
+                for element_type, (count, volume) in by_type.items()
+            },
+            "by_grade": {
+                grade: {
+                    "count": count,
+                    "volume_m3": volume,
+                    "percentage": volume * percent_of_total
+                }
+                for grade, (count, volume) in by_grade.items()
+            },
+            "elements": element_rows
+        }
+        
         return report 
\ No newline at end of file
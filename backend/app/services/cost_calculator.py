@@ -1,5 +1,6 @@
 import logging
 from typing import List, Dict, Optional
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from ..models.models import Element, Material, CostDatabase
 from ..models.schemas import CostCalculationResult, ProjectSummary
@@ -21,6 +22,16 @@ class CostCalculator:
             'roof': 45.0,  # $/m2
         }
         
+        # Default material costs for MVP, used when no material is assigned
+        self.default_material_costs = {
+            'wall': 50.0,  # $/m2
+            'floor': 80.0,  # $/m2
+            'door': 300.0,  # $/unit
+            'window': 400.0,  # $/unit
+            'column': 800.0,  # $/unit
+            'roof': 120.0,  # $/m2
+        }
+        
         self.default_overhead_rate = 0.15  # 15% overhead
         self.default_equipment_rate = 0.10  # 10% equipment cost
     
@@ -37,33 +48,14 @@ class CostCalculator:
         """
         try:
             # Material cost
-            material_cost = 0.0
             if material:
                 material_cost = element.quantity * material.unit_cost
             else:
-                # Use default material costs for MVP
-                default_material_costs = {
-                    'wall': 50.0,  # $/m2
-                    'floor': 80.0,  # $/m2
-                    'door': 300.0,  # $/unit
-                    'window': 400.0,  # $/unit
-                    'column': 800.0,  # $/unit
-                    'roof': 120.0,  # $/m2
-                }
-                material_cost = element.quantity * default_material_costs.get(element.element_type, 100.0)
-            
-            # Labor cost
-            labor_rate = self.default_labor_rates.get(element.element_type, 30.0)
-            labor_cost = element.quantity * labor_rate
-            
-            # Equipment cost
-            equipment_cost = material_cost * self.default_equipment_rate
+                material_cost = element.quantity * self.default_material_costs.get(element.element_type, 100.0)
             
-            # Overhead cost
-            overhead_cost = (material_cost + labor_cost + equipment_cost) * self.default_overhead_rate
-            
-            # Total cost
-            total_cost = material_cost + labor_cost + equipment_cost + overhead_cost
+            labor_cost, equipment_cost, overhead_cost, total_cost = self._apply_rates(
+                element.element_type, element.quantity, material_cost
+            )
             
             # Carbon footprint (if material has carbon factor)
             carbon_footprint = None
@@ -84,6 +76,18 @@ class CostCalculator:
             logger.error(f"Error calculating cost for element {element.id}: {str(e)}")
             raise
     
+    def _apply_rates(self, element_type: str, quantity: float, material_cost: float):
+        """Return (labor, equipment, overhead, total) cost for a material cost.
+
+        Every term is linear in quantity, so this works equally for a single
+        element or for the summed quantity of all elements of one type.
+        """
+        labor_cost = quantity * self.default_labor_rates.get(element_type, 30.0)
+        equipment_cost = material_cost * self.default_equipment_rate
+        overhead_cost = (material_cost + labor_cost + equipment_cost) * self.default_overhead_rate
+        total_cost = material_cost + labor_cost + equipment_cost + overhead_cost
+        return labor_cost, equipment_cost, overhead_cost, total_cost
+    
     def calculate_project_costs(self, db: Session, project_id: int) -> ProjectSummary:
         """
         Calculate total costs for an entire project
@@ -96,75 +100,103 @@ class CostCalculator:
             ProjectSummary with total costs and breakdowns
         """
         try:
-            # Get all elements for the project
-            elements = db.query(Element).filter(Element.project_id == project_id).all()
+            rows = (
+                self._element_cost_totals(db)
+                .filter(Element.project_id == project_id)
+                .group_by(Element.element_type)
+                .all()
+            )
+            return self._summarise_cost_totals(project_id, rows)
             
-            if not elements:
-                return ProjectSummary(
-                    project_id=project_id,
-                    total_elements=0,
-                    total_area=0.0,
-                    total_volume=0.0,
-                    total_cost=0.0,
-                    total_carbon=None,
-                    cost_breakdown={},
-                    element_breakdown={}
-                )
+        except Exception as e:
+            logger.error(f"Error calculating project costs for project {project_id}: {str(e)}")
+            raise
+    
+    def calculate_costs_by_project(self, db: Session) -> Dict[int, ProjectSummary]:
+        """
+        Calculate cost summaries for every project that has elements
+        
+        Args:
+            db: Database session
             
-            # Calculate costs for each element
-            total_cost = 0.0
-            total_carbon = 0.0
-            total_area = 0.0
-            total_volume = 0.0
-            cost_breakdown = {}
-            element_breakdown = {}
+        Returns:
+            ProjectSummary per project ID, from a single grouped query
+        """
+        try:
+            rows = (
+                self._element_cost_totals(db, Element.project_id)
+                .filter(Element.project_id.isnot(None))
+                .group_by(Element.project_id, Element.element_type)
+                .order_by(Element.project_id)
+                .all()
+            )
             
-            for element in elements:
-                # Get associated material
-                material = None
-                if element.material_id:
-                    material = db.query(Material).filter(Material.id == element.material_id).first()
-                
-                # Calculate element cost
-                cost_result = self.calculate_element_cost(element, material)
-                total_cost += cost_result.total_cost
-                
-                # Accumulate areas and volumes
-                if element.area:
-                    total_area += element.area
-                if element.volume:
-                    total_volume += element.volume
-                
-                # Carbon footprint
-                if cost_result.carbon_footprint:
-                    total_carbon += cost_result.carbon_footprint
-                
-                # Cost breakdown by element type
-                element_type = element.element_type
-                if element_type not in cost_breakdown:
-                    cost_breakdown[element_type] = 0.0
-                cost_breakdown[element_type] += cost_result.total_cost
-                
-                # Element count breakdown
-                if element_type not in element_breakdown:
-                    element_breakdown[element_type] = 0
-                element_breakdown[element_type] += 1
+            rows_by_project = {}
+            for project_id, *type_row in rows:
+                rows_by_project.setdefault(project_id, []).append(type_row)
             
-            return ProjectSummary(
-                project_id=project_id,
-                total_elements=len(elements),
-                total_area=total_area,
-                total_volume=total_volume,
-                total_cost=total_cost,
-                total_carbon=total_carbon if total_carbon > 0 else None,
-                cost_breakdown=cost_breakdown,
-                element_breakdown=element_breakdown
-            )
+            return {
+                project_id: self._summarise_cost_totals(project_id, type_rows)
+                for project_id, type_rows in rows_by_project.items()
+            }
             
         except Exception as e:
-            logger.error(f"Error calculating project costs for project {project_id}: {str(e)}")
+            logger.error(f"Error calculating costs by project: {str(e)}")
             raise
     
+    def _element_cost_totals(self, db: Session, *group_columns):
+        """Per element type totals query; callers add the filter and GROUP BY"""
+        # Aggregate per element type in the database rather than per row
+        return (
+            db.query(
+                *group_columns,
+                Element.element_type,
+                func.count(Element.id),
+                func.sum(Element.quantity),
+                func.coalesce(func.sum(Element.area), 0.0),
+                func.coalesce(func.sum(Element.volume), 0.0),
+                func.coalesce(func.sum(Element.quantity * Material.unit_cost), 0.0),
+                func.coalesce(func.sum(case((Material.id.is_(None), Element.quantity), else_=0.0)), 0.0),
+                func.coalesce(func.sum(Element.quantity * Material.carbon_factor), 0.0),
+            )
+            .outerjoin(Material, Element.material_id == Material.id)
+        )
+    
+    def _summarise_cost_totals(self, project_id: int, rows) -> ProjectSummary:
+        """Build a ProjectSummary from the per element type rows of _element_cost_totals"""
+        total_cost = 0.0
+        total_carbon = 0.0
+        total_area = 0.0
+        total_volume = 0.0
+        total_elements = 0
+        cost_breakdown = {}
+        element_breakdown = {}
+        default_material_cost = self.default_material_costs.get
+        
+        for (element_type, count, quantity, area, volume,
+             assigned_material_cost, unassigned_quantity, carbon) in rows:
+            material_cost = assigned_material_cost + unassigned_quantity * default_material_cost(element_type, 100.0)
+            type_cost = self._apply_rates(element_type, quantity, material_cost)[-1]
+            
+            cost_breakdown[element_type] = type_cost
+            element_breakdown[element_type] = count
+            total_cost += type_cost
+            total_area += area
+            total_volume += volume
+            total_carbon += carbon
+            total_elements += count
+        
+        return ProjectSummary(
+            project_id=project_id,
+            total_elements=total_elements,
+            total_area=total_area,
+            total_volume=total_volume,
+            total_cost=total_cost,
+            total_carbon=total_carbon if total_carbon > 0 else None,
+            cost_breakdown=cost_breakdown,
+            element_breakdown=element_breakdown
+        )
+    
     def get_material_suggestions(self, element_type: str) -> List[Dict]:
         """
         Get material suggestions for an element type
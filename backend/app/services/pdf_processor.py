@@ -6,9 +6,17 @@ discipline-specific multi-head inference models.
 """
 
 import os
+import copy
+import hashlib
 import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass
 import json
 import sys
 
@@ -99,16 +107,287 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent / "ml"))
 
+# Compiled classifier for the geometric fallback (requires numba)
+try:
+    ml_path = str(Path(__file__).parent.parent.parent.parent / "ml")
+    if ml_path not in sys.path:
+        sys.path.insert(0, ml_path)
+    
+    from geom_kernels import classify_rects
+    GEOM_KERNELS_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Compiled geometric kernels not available: {e}")
+    GEOM_KERNELS_AVAILABLE = False
+
 # Temporarily disable enhanced material detection to fix backend
 # from enhanced_material_detection import EnhancedMaterialDetector
 
+from ..core.config import settings
+
+PAGE_RENDER_SCALE = 2.0  # Scale factor for better quality
+RESULT_CACHE_MAX = 32  # Processed drawings kept in memory per PDFProcessor
+# Bump when detection output changes so results cached on disk are ignored
+RESULT_CACHE_VERSION = 1
+PAGE_PREFETCH_DEPTH = 2  # Rendered pages buffered ahead of detection
+# Spawned page workers re-import the app and ML stack (~1.5s each), which
+# only pays off against many pages of detection
+PARALLEL_PAGE_MIN_PAGES = 16
+# Pages whose longest side exceeds this many pixels are traced at half size
+PYRDOWN_MIN_IMAGE_SIZE = 4000
+
+# Discipline names used by the API, mapped once to the ML enum
+if ML_AVAILABLE:
+    _DISCIPLINE_MAP = {
+        "architectural": Discipline.ARCHITECTURAL,
+        "structural": Discipline.STRUCTURAL,
+        "civil": Discipline.CIVIL,
+        "mep": Discipline.MEP
+    }
+else:
+    _DISCIPLINE_MAP = {}
+
+
+# Default material per detected element type
+_ELEMENT_MATERIALS = {
+    # Structural elements
+    'beam': 'steel',
+    'column': 'concrete',
+    'slab': 'concrete',
+    'foundation': 'concrete',
+    'wall': 'concrete',
+    'floor': 'concrete',
+    'roof': 'concrete',
+    
+    # Architectural elements
+    'room': 'concrete',
+    'door': 'wood',
+    'window': 'glass',
+    'partition': 'gypsum',
+    
+    # Civil elements
+    'road': 'asphalt',
+    'utility': 'concrete',
+    
+    # MEP elements
+    'hvac_duct': 'steel',
+    'electrical_panel': 'steel',
+    
+    # Default
+    'unknown': 'concrete',
+    'element': 'concrete'
+}
+
+# Material densities in kg/m³
+_MATERIAL_DENSITIES = {
+    'concrete': 2400.0,  # kg/m³, typical thickness 0.2m = 480 kg/m²
+    'steel': 7850.0,     # kg/m³, typical thickness 0.01m = 78.5 kg/m²
+    'wood': 600.0,       # kg/m³, typical thickness 0.05m = 30 kg/m²
+    'glass': 2500.0,     # kg/m³, typical thickness 0.01m = 25 kg/m²
+    'gypsum': 1200.0,    # kg/m³, typical thickness 0.02m = 24 kg/m²
+    'asphalt': 2300.0,   # kg/m³, typical thickness 0.1m = 230 kg/m²
+    'brick': 1800.0,     # kg/m³, typical thickness 0.2m = 360 kg/m²
+    'stone': 2700.0,     # kg/m³, typical thickness 0.2m = 540 kg/m²
+    'tile': 2000.0,      # kg/m³, typical thickness 0.02m = 40 kg/m²
+    'plastic': 1200.0,   # kg/m³, typical thickness 0.01m = 12 kg/m²
+    'aluminum': 2700.0,  # kg/m³, typical thickness 0.01m = 27 kg/m²
+    'copper': 8960.0,    # kg/m³, typical thickness 0.01m = 89.6 kg/m²
+    'zinc': 7140.0,      # kg/m³, typical thickness 0.01m = 71.4 kg/m²
+    'lead': 11340.0,     # kg/m³, typical thickness 0.01m = 113.4 kg/m²
+    'tin': 7310.0,       # kg/m³, typical thickness 0.01m = 73.1 kg/m²
+    'fiberglass': 1800.0, # kg/m³, typical thickness 0.05m = 90 kg/m²
+    'mineral_wool': 100.0, # kg/m³, typical thickness 0.1m = 10 kg/m²
+    'cellulose': 50.0,   # kg/m³, typical thickness 0.1m = 5 kg/m²
+    'spray_foam': 30.0,  # kg/m³, typical thickness 0.1m = 3 kg/m²
+    'paint': 1200.0,     # kg/m³, typical thickness 0.001m = 1.2 kg/m²
+    'carpet': 2000.0,    # kg/m³, typical thickness 0.01m = 20 kg/m²
+    'precast': 2400.0,   # kg/m³, typical thickness 0.2m = 480 kg/m²
+    'cast_in_place': 2400.0, # kg/m³, typical thickness 0.2m = 480 kg/m²
+    'modular': 2400.0,   # kg/m³, typical thickness 0.2m = 480 kg/m²
+    'prefabricated': 2400.0, # kg/m³, typical thickness 0.2m = 480 kg/m²
+    'default': 2400.0    # kg/m³, typical thickness 0.2m = 480 kg/m²
+}
+
+# Typical build-up thickness per material in m
+_MATERIAL_THICKNESSES = {
+    'concrete': 0.2, 'steel': 0.01, 'wood': 0.05, 'glass': 0.01,
+    'gypsum': 0.02, 'asphalt': 0.1, 'brick': 0.2, 'stone': 0.2,
+    'tile': 0.02, 'plastic': 0.01, 'aluminum': 0.01, 'copper': 0.01,
+    'zinc': 0.01, 'lead': 0.01, 'tin': 0.01, 'fiberglass': 0.05,
+    'mineral_wool': 0.1, 'cellulose': 0.1, 'spray_foam': 0.1,
+    'paint': 0.001, 'carpet': 0.01, 'precast': 0.2, 'cast_in_place': 0.2,
+    'modular': 0.2, 'prefabricated': 0.2, 'default': 0.2
+}
+
+# Weight per m² of each material (density * typical thickness)
+_MATERIAL_AREAL_DENSITIES = {
+    material: density * _MATERIAL_THICKNESSES.get(material, 0.2)
+    for material, density in _MATERIAL_DENSITIES.items()
+}
+_DEFAULT_AREAL_DENSITY = 2400.0 * 0.2
+
+def _render_page(page: "fitz.Page", gray: bool = False) -> Tuple[np.ndarray, int]:
+    """
+    Render a PDF page for detection.
+    
+    Grayscale renders only feed geometric detection, which traces large sheets
+    at half size, so sheets that would exceed PYRDOWN_MIN_IMAGE_SIZE at
+    PAGE_RENDER_SCALE are rendered at half that scale instead.
+    
+    Returns:
+        (height, width, 3) uint8 RGB array, or (height, width) if gray, and how
+        many times smaller than PAGE_RENDER_SCALE it was rendered
+    """
+    reduction = 1
+    if gray and max(page.rect.width, page.rect.height) * PAGE_RENDER_SCALE > PYRDOWN_MIN_IMAGE_SIZE:
+        reduction = 2
+    
+    scale = PAGE_RENDER_SCALE / reduction
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False,
+                          colorspace=fitz.csGRAY if gray else fitz.csRGB)
+    image = np.frombuffer(pix.samples, dtype=np.uint8)
+    image = image.reshape(pix.height, pix.width) if gray else image.reshape(pix.height, pix.width, 3)
+    return image, reduction
+
+
+def _json_default(value: Any) -> Any:
+    """JSON fallback for the NumPy scalars some detectors leave in results"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_PREFETCH_DONE = object()
+
+
+def _prefetch(items: Iterator[Any], depth: int = PAGE_PREFETCH_DEPTH) -> Iterator[Any]:
+    """Advance an iterator on a background thread, keeping up to depth items ready.
+    
+    Rendering the next page then overlaps detection of the current one; MuPDF and
+    OpenCV both release the GIL while they work.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for item in items:
+                buffer.put((item, None))
+                if stop.is_set():
+                    break
+            buffer.put((_PREFETCH_DONE, None))
+        except Exception as e:
+            buffer.put((_PREFETCH_DONE, e))
+        finally:
+            items.close()
+    
+    producer = threading.Thread(target=produce, name="pdf-page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _PREFETCH_DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # Unblock a producer waiting on a full buffer if the consumer stopped early
+        stop.set()
+        while producer.is_alive():
+            try:
+                buffer.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+
+@dataclass(slots=True)
+class Detections:
+    """Geometric detections of one page, kept column-wise until formatting"""
+    types: Tuple[str, ...]          # element type per type id
+    confidences: Tuple[float, ...]  # confidence per type id
+    type_ids: np.ndarray            # (N,) int8 index into types
+    rects: np.ndarray               # (N, 4) int32 x, y, w, h
+    discipline: str
+    image_index: int = 0
+    
+    def __len__(self) -> int:
+        return len(self.type_ids)
+    
+    def to_formatted(self, first_id: int = 0) -> List[Dict[str, Any]]:
+        """Materialise the output element dicts, numbering ids from first_id"""
+        formatted = []
+        for n, ((x, y, w, h), type_id) in enumerate(zip(self.rects.tolist(), self.type_ids.tolist()), first_id):
+            element_type = self.types[type_id]
+            formatted.append({
+                "id": f"{element_type}_{n:03d}",
+                "type": element_type,
+                "bbox": [x, y, x + w, y + h],
+                "confidence": self.confidences[type_id],
+                "properties": {
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                "discipline": self.discipline
+            })
+        return formatted
+
+
+PageElements = Union[List[Dict[str, Any]], Detections]
+
+
+def _tag_page(elements: PageElements, page_num: int) -> List[Union[Dict[str, Any], Detections]]:
+    """Record the page index on a page's detections, ready to extend all_elements"""
+    if isinstance(elements, Detections):
+        elements.image_index = page_num
+        return [elements]
+    for element in elements:
+        element['image_index'] = page_num
+    return elements
+
+
+# Document opened once per page-pool worker process by _open_worker_document
+_worker_document: Optional["fitz.Document"] = None
+
+
+def _open_worker_document(pdf_path: str) -> None:
+    """Pool initializer: give each worker process its own handle on the PDF"""
+    global _worker_document
+    _worker_document = fitz.open(pdf_path)
+
+
+def _process_page(page_num: int, discipline: str) -> List[Union[Dict[str, Any], Detections]]:
+    """Worker: render one page and detect its elements with this process's pdf_processor"""
+    image, reduction = _render_page(_worker_document[page_num], gray=pdf_processor.geometric_only)
+    return _tag_page(pdf_processor._detect_elements(image, discipline, reduction), page_num)
+
+
 class PDFProcessor:
     """Processes PDF drawings and extracts elements using AI models."""
     
     def __init__(self):
+        # (pdf_path, mtime, discipline) -> successful process_pdf_drawing result
+        self._results_cache: Dict[Tuple[str, float, str], Dict[str, Any]] = {}
+        # (pdf_path, mtime, discipline) -> first-page detection priced by estimate_costs
+        self._cost_detections_cache: Dict[Tuple[str, float, str], Dict[str, Any]] = {}
+        # Routes and background tasks share the instance across threads
+        self._cache_lock = threading.Lock()
         self._validate_dependencies()
         self._initialize_ml_components()
         self._log_initialization_status()
+        
+        # Geometric fallback detector per discipline; anything else is generic
+        self._geometric_detectors = {
+            "architectural": self._detect_architectural_elements,
+            "structural": self._detect_structural_elements,
+            "civil": self._detect_civil_elements,
+            "mep": self._detect_mep_elements
+        }
+    
+    @property
+    def geometric_only(self) -> bool:
+        """True when detection falls back to geometric analysis, which only needs grayscale."""
+        return not self.enhanced_system and not ML_AVAILABLE
     
     def _validate_dependencies(self):
         """Validate required dependencies are available."""
@@ -193,16 +472,97 @@ class PDFProcessor:
         Returns:
             Dictionary containing processing results
         """
+        # Writing page images is a side effect the cache can't replay
+        if output_dir is not None:
+            return self._process_pdf_drawing(pdf_path, discipline, output_dir)
+        
+        # Callers enrich elements in place; keep the cached copy pristine
+        return copy.deepcopy(self._get_or_detect(pdf_path, discipline))
+    
+    def _get_or_detect(self, pdf_path: str, discipline: str) -> Dict[str, Any]:
+        """Processing results for a drawing, detecting only on a cache miss.
+        
+        The returned dict is shared with the cache and must not be modified.
+        """
+        return self._cached(self._results_cache, pdf_path, discipline,
+                            lambda: self._load_or_process(pdf_path, discipline))
+    
+    def _load_or_process(self, pdf_path: str, discipline: str) -> Dict[str, Any]:
+        """
+        Process a PDF, reusing results persisted under settings.pdf_results_cache_dir.
+        
+        Entries are keyed by a hash of the file contents, so re-uploads of the
+        same drawing hit regardless of path, together with the discipline, the
+        detection method available and RESULT_CACHE_VERSION.
+        """
+        if not settings.pdf_results_cache_dir:
+            return self._process_pdf_drawing(pdf_path, discipline)
+        
+        try:
+            with open(pdf_path, "rb") as f:
+                digest = hashlib.file_digest(f, "sha256")
+        except OSError:
+            return self._process_pdf_drawing(pdf_path, discipline)
+        
+        method = "enhanced" if self.enhanced_system else "multi_head" if ML_AVAILABLE else "geometric"
+        digest.update(f"|{discipline}|{method}|{RESULT_CACHE_VERSION}".encode())
+        cache_path = Path(settings.pdf_results_cache_dir) / f"{digest.hexdigest()}.json"
+        
+        try:
+            with open(cache_path) as f:
+                result = json.load(f)
+            logger.info(f"Using results cached on disk for PDF: {pdf_path}")
+            return result
+        except (OSError, ValueError):
+            pass
+        
+        result = self._process_pdf_drawing(pdf_path, discipline)
+        if "error" not in result:
+            try:
+                payload = json.dumps(result, default=_json_default)
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename, so concurrent readers never see a partial file
+                tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_text(payload)
+                os.replace(tmp_path, cache_path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Could not cache results for PDF {pdf_path}: {e}")
+        
+        return result
+    
+    def _cached(self, cache: Dict, pdf_path: str, discipline: str, compute) -> Optional[Dict[str, Any]]:
+        """Memoise compute() by (pdf_path, mtime, discipline); empty or error results aren't kept"""
+        try:
+            key = (pdf_path, os.path.getmtime(pdf_path), discipline)
+        except OSError:
+            return compute()
+        
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            if result is None or "error" in result:
+                return result
+            with self._cache_lock:
+                if len(cache) >= RESULT_CACHE_MAX:
+                    cache.pop(next(iter(cache), None), None)
+                cache[key] = result
+        else:
+            logger.info(f"Using cached results for PDF: {pdf_path}")
+        
+        return result
+    
+    def _process_pdf_drawing(self, 
+                            pdf_path: str, 
+                            discipline: str,
+                            output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Rasterise and detect every page of a PDF; see process_pdf_drawing."""
         logger.info(f"Processing PDF: {pdf_path}")
         logger.info(f"Discipline: {discipline}")
         
         try:
-            # Extract images from PDF
-            images = self._extract_images_from_pdf(pdf_path, output_dir)
-            logger.info(f"Extracted {len(images)} images from PDF: {pdf_path}")
-            
             all_elements = []
             processing_method = "geometric_fallback"
+            images_processed = 0
             
             # Temporarily disable enhanced material detection
             # if self.enhanced_material_detector:
@@ -244,33 +604,34 @@ class PDFProcessor:
             # Fallback to original detection method
             logger.info("Using fallback detection method")
             
-            for i, image_path in enumerate(images):
-                logger.info(f"Processing image {i+1}/{len(images)}: {image_path}")
-                
-                # Load image
-                image = cv2.imread(image_path)
-                if image is None:
-                    logger.error(f"Failed to load image: {image_path}")
-                    continue
-                
-                logger.info(f"Loaded image: {image_path}, shape: {image.shape}, dtype: {image.dtype}")
-                
-                # Convert BGR to RGB and ensure proper format
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                
-                # Ensure image is in uint8 format
-                if image_rgb.dtype != np.uint8:
-                    image_rgb = image_rgb.astype(np.uint8)
-                
-                # Detect elements using multi-head inference
-                elements = self._detect_elements(image_rgb, discipline)
-                
-                # Add image information to elements
-                for element in elements:
-                    element['image_index'] = i
-                    element['image_path'] = image_path
-                
-                all_elements.extend(elements)
+            with fitz.open(pdf_path) as pdf_document:
+                page_count = len(pdf_document)
+            workers = min(page_count, settings.pdf_page_workers or os.cpu_count() or 1)
+            
+            if page_count >= PARALLEL_PAGE_MIN_PAGES and workers > 1 and output_dir is None:
+                # Pages are independent; each worker renders and detects its own.
+                # spawn avoids forking the server's threads, and map keeps page order.
+                with ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_open_worker_document, initargs=(pdf_path,)
+                ) as pool:
+                    for page_elements in pool.map(_process_page, range(page_count), repeat(discipline)):
+                        all_elements.extend(page_elements)
+                images_processed = page_count
+            else:
+                # Pages are rendered straight into arrays on a producer thread
+                pages = _prefetch(self._extract_page_arrays(pdf_path, output_dir, gray=self.geometric_only))
+                for i, (image, reduction) in enumerate(pages):
+                    logger.info(f"Processing page {i+1}: shape: {image.shape}, dtype: {image.dtype}")
+                    images_processed += 1
+                    
+                    # Detect elements using multi-head inference
+                    elements = self._detect_elements(image, discipline, reduction)
+                    
+                    # Add image information to elements
+                    all_elements.extend(_tag_page(elements, i))
+            
+            logger.info(f"Extracted {images_processed} page images from PDF: {pdf_path}")
             
             # Convert to the expected format
             formatted_elements = self._format_elements(all_elements)
@@ -279,9 +640,10 @@ class PDFProcessor:
             logger.debug(f"Successfully processed {len(formatted_elements)} elements using {processing_method} method")
             
             return {
+                "status": "success",
                 "elements": formatted_elements,
                 "total_elements": len(formatted_elements),
-                "images_processed": len(images),
+                "images_processed": images_processed,
                 "discipline": discipline,
                 "processing_method": processing_method
             }
@@ -289,6 +651,7 @@ class PDFProcessor:
         except Exception as e:
             logger.error(f"Error processing PDF {pdf_path}: {e}")
             return {
+                "status": "error",
                 "elements": [],
                 "total_elements": 0,
                 "images_processed": 0,
@@ -324,40 +687,25 @@ class PDFProcessor:
             }
         
         try:
-            # Extract first image from PDF for cost analysis
-            images = self._extract_images_from_pdf(pdf_path)
-            if not images:
-                return {
-                    "error": "No images extracted from PDF",
-                    "total_cost": 0.0,
-                    "currency": "USD"
-                }
+            # Map discipline string to enum
+            discipline_enum = _DISCIPLINE_MAP.get(discipline.lower(), Discipline.ARCHITECTURAL)
             
-            # Load first image
-            image = cv2.imread(images[0])
-            if image is None:
+            # Detection doesn't depend on project_scale, so estimates of the same
+            # drawing at different scales share one detection pass
+            detection_results = self._cached(
+                self._cost_detections_cache, pdf_path, discipline,
+                lambda: self._detect_cost_page(pdf_path, discipline_enum)
+            )
+            if detection_results is None:
                 return {
-                    "error": "Failed to load image for cost analysis",
+                    "error": "No images extracted from PDF",
                     "total_cost": 0.0,
                     "currency": "USD"
                 }
             
-            # Convert BGR to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-            # Map discipline string to enum
-            discipline_map = {
-                "architectural": Discipline.ARCHITECTURAL,
-                "structural": Discipline.STRUCTURAL,
-                "civil": Discipline.CIVIL,
-                "mep": Discipline.MEP
-            }
-            
-            discipline_enum = discipline_map.get(discipline.lower(), Discipline.ARCHITECTURAL)
-            
             # Perform cost analysis
-            cost_analysis = self.cost_estimator.analyze_drawing_costs(
-                image_rgb, discipline_enum, project_scale
+            cost_analysis = self.cost_estimator.analyze_detection_costs(
+                detection_results, project_scale
             )
             
             # Generate comprehensive report
@@ -390,6 +738,18 @@ class PDFProcessor:
                 "processing_method": "error"
             }
     
+    def _detect_cost_page(self, pdf_path: str, discipline_enum: "Discipline") -> Optional[Dict[str, Any]]:
+        """Run the cost estimator's detection on the first page; None if the PDF has no pages"""
+        # Cost analysis only looks at the first page, so render just that one
+        first_page = next(self._extract_page_arrays(pdf_path, max_pages=1), None)
+        if first_page is None:
+            return None
+        
+        image_rgb, _ = first_page
+        return self.cost_estimator.enhanced_system.detect_elements_enhanced(
+            image_rgb, discipline_enum, use_ocr=True
+        )
+    
     def analyze_carbon_footprint(self, 
                                 pdf_path: str, 
                                 discipline: str = "architectural",
@@ -416,13 +776,13 @@ class PDFProcessor:
             }
         
         try:
-            # Process PDF to get elements
-            processing_results = self.process_pdf_drawing(pdf_path, discipline)
+            # Process PDF to get elements; read-only, so the cached result is used as is
+            processing_results = self._get_or_detect(pdf_path, discipline)
             
-            if processing_results['status'] != 'success':
+            if processing_results.get('status') != 'success':
                 return {
                     'status': 'error',
-                    'message': f'Failed to process PDF: {processing_results.get("message", "Unknown error")}',
+                    'message': f'Failed to process PDF: {processing_results.get("error", "Unknown error")}',
                     'timestamp': '2024-01-01T00:00:00'
                 }
             
@@ -768,6 +1128,32 @@ class PDFProcessor:
             logger.error(f"Error getting cross-references: {e}")
             return []
     
+    def _extract_page_arrays(self, pdf_path: str, output_dir: Optional[str] = None,
+                             max_pages: Optional[int] = None, gray: bool = False) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Render PDF pages to RGB or grayscale arrays, one page at a time.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            output_dir: If given, each page is also saved there as page_<n>.png
+            max_pages: Stop after this many pages (default: every page)
+            gray: Render single-channel grayscale instead of RGB
+            
+        Yields:
+            (height, width, 3) uint8 RGB array per page, or (height, width) if gray,
+            with its reduction from PAGE_RENDER_SCALE (see _render_page)
+        """
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        with fitz.open(pdf_path) as pdf_document:
+            for page_num, page in enumerate(islice(pdf_document, max_pages)):
+                image, reduction = _render_page(page, gray)
+                if output_dir is not None:
+                    cv2.imwrite(os.path.join(output_dir, f"page_{page_num + 1}.png"),
+                                image if gray else cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+                yield image, reduction
+    
     def _extract_images_from_pdf(self, pdf_path: str, output_dir: Optional[str] = None) -> List[str]:
         """Extract images from PDF file."""
         if output_dir is None:
@@ -801,30 +1187,22 @@ class PDFProcessor:
         
         return image_paths
     
-    def _detect_elements(self, image: np.ndarray, discipline: str) -> List[Dict[str, Any]]:
+    def _detect_elements(self, image: np.ndarray, discipline: str, reduction: int = 1) -> PageElements:
         """
         Detect elements in image using discipline-specific models.
         
         Args:
             image: Input image as numpy array
             discipline: Discipline category
+            reduction: How many times smaller than PAGE_RENDER_SCALE the page was rendered
             
         Returns:
-            List of detected elements
+            List of detected elements, or Detections from the geometric fallback
         """
-        # Map discipline string to enum
-        discipline_map = {
-            "architectural": Discipline.ARCHITECTURAL,
-            "structural": Discipline.STRUCTURAL,
-            "civil": Discipline.CIVIL,
-            "mep": Discipline.MEP
-        }
-        
-        discipline_enum = discipline_map.get(discipline.lower(), Discipline.ARCHITECTURAL)
-        
         # Use enhanced inference if available
         if self.enhanced_system:
             logger.info(f"Using enhanced inference for discipline: {discipline}")
+            discipline_enum = _DISCIPLINE_MAP.get(discipline.lower(), Discipline.ARCHITECTURAL)
             enhanced_results = self.enhanced_system.detect_elements_enhanced(
                 image, discipline_enum, use_ocr=True
             )
@@ -837,8 +1215,9 @@ class PDFProcessor:
             # This part of the code was not provided in the original file,
             # so we'll assume it's available and use it as a fallback.
             # If MultiHeadInferenceSystem is not available, this will raise an error.
+            discipline_enum = _DISCIPLINE_MAP.get(discipline.lower(), Discipline.ARCHITECTURAL)
             try:
-                from multi_head_inference import MultiHeadInferenceSystem, Discipline
+                from multi_head_inference import MultiHeadInferenceSystem
                 detection_results = MultiHeadInferenceSystem().detect_elements(
                     image, discipline_enum, confidence_threshold=0.5
                 )
@@ -862,10 +1241,14 @@ class PDFProcessor:
         else:
             # Fallback to geometric detection
             logger.info(f"Using geometric fallback detection for discipline: {discipline}")
-            return self._geometric_detection(image, discipline)
+            return self._geometric_detection(image, discipline, reduction)
     
-    def _detect_elements_by_discipline(self, contours: List, discipline: str) -> List[Dict[str, Any]]:
-        """Detect elements based on discipline using unified detection logic."""
+    def _detect_elements_by_discipline(self, rects: np.ndarray, discipline: str) -> Detections:
+        """Detect elements based on discipline using unified detection logic.
+        
+        rects is an (N, 4) int32 array of contour bounding rects (x, y, w, h);
+        every rect is classified in one pass, compiled with numba when available.
+        """
         detection_configs = {
             "architectural": {
                 "elements": [
@@ -896,130 +1279,115 @@ class PDFProcessor:
         }
         
         config = detection_configs.get(discipline, detection_configs["architectural"])
-        elements = []
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            area = w * h
-            aspect_ratio = w / h if h > 0 else 0
-            
-            for element_config in config["elements"]:
-                if self._matches_element_criteria(aspect_ratio, area, element_config):
-                    elements.append(self._create_element_dict(
-                        element_config["type"], x, y, w, h, area, 
-                        element_config["confidence"], discipline
-                    ))
-                    break  # Only match one element type per contour
         
-        return elements
-    
-    def _matches_element_criteria(self, aspect_ratio: float, area: float, config: Dict) -> bool:
-        """Check if contour matches element criteria."""
-        min_ratio, max_ratio = config["aspect_ratio"]
-        min_area, max_area = config["area_range"]
+        if GEOM_KERNELS_AVAILABLE:
+            type_index = classify_rects(
+                rects,
+                np.array([c["aspect_ratio"] for c in config["elements"]], dtype=np.float64),
+                np.array([c["area_range"] for c in config["elements"]], dtype=np.float64),
+            )
+        else:
+            w = rects[:, 2]
+            h = rects[:, 3]
+            area = w.astype(np.int64) * h
+            aspect_ratio = np.divide(w, h, out=np.zeros(len(rects)), where=h > 0)
+            
+            # Index of the first matching config per rect; -1 where none matched
+            type_index = np.full(len(rects), -1, dtype=np.int8)
+            for i, element_config in enumerate(config["elements"]):
+                min_ratio, max_ratio = element_config["aspect_ratio"]
+                min_area, max_area = element_config["area_range"]
+                matches = ((type_index < 0) &
+                           (min_ratio <= aspect_ratio) & (aspect_ratio <= max_ratio) &
+                           (min_area <= area) & (area <= max_area))
+                type_index[matches] = i
         
-        return (min_ratio <= aspect_ratio <= max_ratio and 
-                min_area <= area <= max_area)
-    
-    def _create_element_dict(self, element_type: str, x: int, y: int, w: int, h: int, 
-                           area: float, confidence: float, discipline: str) -> Dict[str, Any]:
-        """Create standardized element dictionary."""
-        return {
-            "type": element_type,
-            "bbox": [x, y, x + w, y + h],
-            "confidence": confidence,
-            "properties": {
-                "width": w,
-                "height": h,
-                "area": area
-            },
-            "discipline": discipline
-        }
+        # Keep matching rects in contour order
+        matched = type_index >= 0
+        return Detections(
+            types=tuple(c["type"] for c in config["elements"]),
+            confidences=tuple(c["confidence"] for c in config["elements"]),
+            type_ids=type_index[matched],
+            rects=rects[matched],
+            discipline=discipline
+        )
     
-    def _detect_architectural_elements(self, contours: List) -> List[Dict[str, Any]]:
+    def _detect_architectural_elements(self, rects: np.ndarray) -> Detections:
         """Detect architectural elements using geometric analysis."""
-        return self._detect_elements_by_discipline(contours, "architectural")
+        return self._detect_elements_by_discipline(rects, "architectural")
     
-    def _detect_structural_elements(self, contours: List) -> List[Dict[str, Any]]:
+    def _detect_structural_elements(self, rects: np.ndarray) -> Detections:
         """Detect structural elements using geometric analysis."""
-        return self._detect_elements_by_discipline(contours, "structural")
+        return self._detect_elements_by_discipline(rects, "structural")
     
-    def _detect_civil_elements(self, contours: List) -> List[Dict[str, Any]]:
+    def _detect_civil_elements(self, rects: np.ndarray) -> Detections:
         """Detect civil engineering elements using geometric analysis."""
-        return self._detect_elements_by_discipline(contours, "civil")
+        return self._detect_elements_by_discipline(rects, "civil")
     
-    def _detect_mep_elements(self, contours: List) -> List[Dict[str, Any]]:
+    def _detect_mep_elements(self, rects: np.ndarray) -> Detections:
         """Detect MEP elements using geometric analysis."""
-        return self._detect_elements_by_discipline(contours, "mep")
+        return self._detect_elements_by_discipline(rects, "mep")
     
-    def _geometric_detection(self, image: np.ndarray, discipline: str) -> List[Dict[str, Any]]:
+    def _geometric_detection(self, image: np.ndarray, discipline: str, reduction: int = 1) -> Detections:
         """
         Fallback geometric detection method.
         
         Args:
             image: Input image
             discipline: Discipline category
+            reduction: How many times smaller than PAGE_RENDER_SCALE the page was rendered;
+                rects are scaled back so sizes stay in full-render pixels
             
         Returns:
-            List of detected elements
+            Detected elements, column-wise
         """
-        elements = []
-        
         # Convert to grayscale
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
         else:
             gray = image
         
+        # Large rendered sheets carry far more pixels than Canny needs; trace
+        # them at half size and scale the rects back to page coordinates
+        scale = 2 if max(gray.shape) > PYRDOWN_MIN_IMAGE_SIZE else 1
+        if scale > 1:
+            gray = cv2.pyrDown(gray)
+        
         # Edge detection
         edges = cv2.Canny(gray, 50, 150)
         
         # Find contours
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        # Discipline-specific element detection
-        if discipline.lower() == "architectural":
-            elements = self._detect_architectural_elements(contours)
-        elif discipline.lower() == "structural":
-            elements = self._detect_structural_elements(contours)
-        elif discipline.lower() == "civil":
-            elements = self._detect_civil_elements(contours)
-        elif discipline.lower() == "mep":
-            elements = self._detect_mep_elements(contours)
-        else:
-            # Generic detection
-            elements = self._detect_generic_elements(contours)
+        # Bounding rects of all contours as one (N, 4) array: x, y, w, h
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
+        rects *= scale * reduction
         
-        return elements
+        # Discipline-specific element detection
+        detect = self._geometric_detectors.get(discipline.lower(), self._detect_generic_elements)
+        return detect(rects)
     
-    def _detect_generic_elements(self, contours: List) -> List[Dict[str, Any]]:
+    def _detect_generic_elements(self, rects: np.ndarray) -> Detections:
         """Generic element detection for unknown disciplines."""
-        elements = []
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            area = w * h
-            
-            if area > 500:  # Minimum area threshold
-                elements.append({
-                    "type": "element",
-                    "bbox": [x, y, x + w, y + h],
-                    "confidence": 0.60,
-                    "properties": {
-                        "width": w,
-                        "height": h,
-                        "area": area
-                    },
-                    "discipline": "generic"
-                })
-        
-        return elements
+        area = rects[:, 2].astype(np.int64) * rects[:, 3]
+        rects = rects[area > 500]  # Minimum area threshold
+        return Detections(
+            types=("element",),
+            confidences=(0.60,),
+            type_ids=np.zeros(len(rects), dtype=np.int8),
+            rects=rects,
+            discipline="generic"
+        )
     
-    def _format_elements(self, elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _format_elements(self, elements: List[Union[Dict[str, Any], Detections]]) -> List[Dict[str, Any]]:
         """Format elements to match the expected output format."""
         formatted_elements = []
         
         for element in elements:
+            if isinstance(element, Detections):
+                formatted_elements.extend(element.to_formatted(len(formatted_elements)))
+                continue
+            
             formatted_element = {
                 "id": f"{element.get('type', 'element')}_{len(formatted_elements):03d}",
                 "type": element.get("type", "element"),
@@ -1034,109 +1402,40 @@ class PDFProcessor:
     
     def _assign_material_to_element(self, element_type: str) -> str:
         """Assign default material based on element type"""
-        material_mapping = {
-            # Structural elements
-            'beam': 'steel',
-            'column': 'concrete',
-            'slab': 'concrete',
-            'foundation': 'concrete',
-            'wall': 'concrete',
-            'floor': 'concrete',
-            'roof': 'concrete',
-            
-            # Architectural elements
-            'room': 'concrete',
-            'door': 'wood',
-            'window': 'glass',
-            'partition': 'gypsum',
-            
-            # Civil elements
-            'road': 'asphalt',
-            'utility': 'concrete',
-            
-            # MEP elements
-            'hvac_duct': 'steel',
-            'electrical_panel': 'steel',
-            
-            # Default
-            'unknown': 'concrete',
-            'element': 'concrete'
-        }
-        return material_mapping.get(element_type.lower(), 'concrete')
+        return _ELEMENT_MATERIALS.get(element_type.lower(), 'concrete')
     
     def _get_material_density(self, material: str) -> float:
         """Get material density in kg per m² for area to weight conversion"""
-        density_mapping = {
-            'concrete': 2400.0,  # kg/m³, typical thickness 0.2m = 480 kg/m²
-            'steel': 7850.0,     # kg/m³, typical thickness 0.01m = 78.5 kg/m²
-            'wood': 600.0,       # kg/m³, typical thickness 0.05m = 30 kg/m²
-            'glass': 2500.0,     # kg/m³, typical thickness 0.01m = 25 kg/m²
-            'gypsum': 1200.0,    # kg/m³, typical thickness 0.02m = 24 kg/m²
-            'asphalt': 2300.0,   # kg/m³, typical thickness 0.1m = 230 kg/m²
-            'brick': 1800.0,     # kg/m³, typical thickness 0.2m = 360 kg/m²
-            'stone': 2700.0,     # kg/m³, typical thickness 0.2m = 540 kg/m²
-            'tile': 2000.0,      # kg/m³, typical thickness 0.02m = 40 kg/m²
-            'plastic': 1200.0,   # kg/m³, typical thickness 0.01m = 12 kg/m²
-            'aluminum': 2700.0,  # kg/m³, typical thickness 0.01m = 27 kg/m²
-            'copper': 8960.0,    # kg/m³, typical thickness 0.01m = 89.6 kg/m²
-            'zinc': 7140.0,      # kg/m³, typical thickness 0.01m = 71.4 kg/m²
-            'lead': 11340.0,     # kg/m³, typical thickness 0.01m = 113.4 kg/m²
-            'tin': 7310.0,       # kg/m³, typical thickness 0.01m = 73.1 kg/m²
-            'fiberglass': 1800.0, # kg/m³, typical thickness 0.05m = 90 kg/m²
-            'mineral_wool': 100.0, # kg/m³, typical thickness 0.1m = 10 kg/m²
-            'cellulose': 50.0,   # kg/m³, typical thickness 0.1m = 5 kg/m²
-            'spray_foam': 30.0,  # kg/m³, typical thickness 0.1m = 3 kg/m²
-            'paint': 1200.0,     # kg/m³, typical thickness 0.001m = 1.2 kg/m²
-            'carpet': 2000.0,    # kg/m³, typical thickness 0.01m = 20 kg/m²
-            'precast': 2400.0,   # kg/m³, typical thickness 0.2m = 480 kg/m²
-            'cast_in_place': 2400.0, # kg/m³, typical thickness 0.2m = 480 kg/m²
-            'modular': 2400.0,   # kg/m³, typical thickness 0.2m = 480 kg/m²
-            'prefabricated': 2400.0, # kg/m³, typical thickness 0.2m = 480 kg/m²
-            'default': 2400.0    # kg/m³, typical thickness 0.2m = 480 kg/m²
-        }
-        
-        # Return density per m² (density * typical thickness)
-        base_density = density_mapping.get(material, 2400.0)
-        typical_thickness = {
-            'concrete': 0.2, 'steel': 0.01, 'wood': 0.05, 'glass': 0.01,
-            'gypsum': 0.02, 'asphalt': 0.1, 'brick': 0.2, 'stone': 0.2,
-            'tile': 0.02, 'plastic': 0.01, 'aluminum': 0.01, 'copper': 0.01,
-            'zinc': 0.01, 'lead': 0.01, 'tin': 0.01, 'fiberglass': 0.05,
-            'mineral_wool': 0.1, 'cellulose': 0.1, 'spray_foam': 0.1,
-            'paint': 0.001, 'carpet': 0.01, 'precast': 0.2, 'cast_in_place': 0.2,
-            'modular': 0.2, 'prefabricated': 0.2, 'default': 0.2
-        }
-        
-        thickness = typical_thickness.get(material, 0.2)
-        return base_density * thickness
+        return _MATERIAL_AREAL_DENSITIES.get(material, _DEFAULT_AREAL_DENSITY)
 
     def _save_elements_to_database(self, elements: List[Dict], pdf_path: str, discipline: str):
         """
-        Save enhanced elements to database with material information
+        Save enhanced elements to database in a single batched insert
         """
         try:
-            from app.models.models import Element
-            from app.database import get_db
-            
-            db = next(get_db())
-            
-            for element_data in elements:
-                element = Element(
-                    element_type=element_data['element_type'],
-                    material=element_data.get('material', 'unknown'),
-                    quantity=element_data['quantity'],
-                    unit=element_data['unit'],
-                    area=element_data.get('area', 0),
-                    confidence_score=element_data['confidence_score'],
-                    material_confidence=element_data.get('material_confidence', 0.0),
-                    bbox=str(element_data['bbox']),
-                    properties=str(element_data.get('properties', {})),
-                    text_references=str(element_data.get('text_references', [])),
-                    drawing_id=self._get_drawing_id_from_path(pdf_path)
-                )
-                db.add(element)
+            from ..models.models import Element
+            from ..core.database import SessionLocal
+            
+            drawing_id = self._get_drawing_id_from_path(pdf_path)
+            rows = [
+                {
+                    'element_type': element_data['element_type'],
+                    'quantity': element_data['quantity'],
+                    'unit': element_data['unit'],
+                    'area': element_data.get('area', 0),
+                    'confidence_score': element_data['confidence_score'],
+                    'bounding_box': element_data['bbox'],
+                    'drawing_id': drawing_id,
+                }
+                for element_data in elements
+            ]
             
-            db.commit()
+            db = SessionLocal()
+            try:
+                Element.bulk_create(db, rows, returning=False)
+                db.commit()
+            finally:
+                db.close()
             logger.info(f"Saved {len(elements)} enhanced elements to database")
             
         except Exception as e:
@@ -1146,14 +1445,13 @@ class PDFProcessor:
         """
         Extract drawing ID from PDF path
         """
+        # Extract project ID from path like "uploads/1/filename.pdf"; Path
+        # splits on the platform's separators, so Windows paths parse too
+        path_parts = Path(pdf_path).parts
         try:
-            # Extract project ID from path like "uploads/1/filename.pdf"
-            path_parts = pdf_path.split('/')
-            if len(path_parts) >= 2:
-                return int(path_parts[1])  # Project ID
+            return int(path_parts[1])  # Project ID
+        except (IndexError, ValueError):
             return 1  # Default fallback
-        except:
-            return 1
 
 # Global instance
 pdf_processor = PDFProcessor() 
\ No newline at end of file
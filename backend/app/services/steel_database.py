@@ -1,8 +1,8 @@
 import logging
-import json
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
+from ..core.database import get_current_session
 from ..models.models import SteelSection, SteelElement
 from ..models.schemas import SteelSectionCreate, SteelElementCreate
 import cv2
@@ -11,11 +11,43 @@ from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Steel section references in drawing text, compiled once and scanned in this order
+_STEEL_SECTION_PATTERNS = {
+    section_type: re.compile(pattern, re.IGNORECASE)
+    for section_type, pattern in {
+        # British Steel sections
+        'UB': r'(\d{3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 305 x 102 x 25
+        'UC': r'(\d{3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 305 x 305 x 118
+        'UA': r'(\d{2,3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 200 x 100 x 10
+        
+        # Hollow sections with prefixes
+        'CHS': r'CHS\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # CHS 21.3 x 3.0
+        'RHS': r'RHS\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # RHS 50 x 30 x 3.2
+        'SHS': r'SHS\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # SHS 20 x 20 x 2.0
+        
+        # Hollow sections without prefixes (need to be detected by context)
+        'CHS_IMPLICIT': r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)(?!\s*x)',  # 21.3 x 3.0 (two dimensions)
+        'RHS_IMPLICIT': r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # 50 x 30 x 3.2 (three dimensions)
+    }.items()
+}
+
+# Explicit kg/m values in section tables; also covers kg/meter, kg/m² and kg/m2
+_KG_PER_METER_RE = re.compile(r'(\d+\.?\d*)\s*kg/m', re.IGNORECASE)
+_SECTION_DIMENSIONS_RE = re.compile(r'(\d+)\s*x\s*(\d+)\s*x\s*(\d+)')  # 127 x 76 x 13
+_NUMBER_RE = re.compile(r'\b(\d+\.?\d*)\b')
+_COLUMN_SEPARATOR_RE = re.compile(r'\s*\|\s*|\s+')
+
+_SECTION_CACHE_MAX = 512
+
 class SteelDatabaseService:
     """Service for managing steel section database and detection"""
     
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self, db: Optional[Session] = None):
+        # Without an explicit session the service uses the request-scoped one
+        self._db = db
+        # section_name -> SteelSection (or None for names that don't exist),
+        # for repeated lookups during one detection run
+        self._sections: Dict[str, Optional[SteelSection]] = {}
         # Updated patterns for British Steel UK sections
         self.section_patterns = {
             'UB': r'(\d{3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 305 x 102 x 25
@@ -34,18 +66,57 @@ class SteelDatabaseService:
             'TUBE': 'Tube'
         }
     
+    @property
+    def db(self) -> Session:
+        """Database session used by the service"""
+        return self._db if self._db is not None else get_current_session()
+    
     def add_steel_section(self, section_data: SteelSectionCreate) -> SteelSection:
         """Add a new steel section to the database"""
         db_section = SteelSection(**section_data.dict())
         self.db.add(db_section)
         self.db.commit()
         self.db.refresh(db_section)
+        self._sections.pop(section_data.section_name, None)
         logger.info(f"Added steel section: {section_data.section_name}")
         return db_section
     
     def get_steel_section(self, section_name: str) -> Optional[SteelSection]:
-        """Get steel section by name"""
-        return self.db.query(SteelSection).filter(SteelSection.section_name == section_name).first()
+        """Get steel section by name, querying the database only on a cache miss"""
+        if section_name in self._sections:
+            return self._sections[section_name]
+        
+        section = self.db.query(SteelSection).filter(SteelSection.section_name == section_name).first()
+        self._remember(section_name, section)
+        return section
+    
+    def get_steel_sections(self, section_names: Iterable[str]) -> Dict[str, SteelSection]:
+        """Get the existing steel sections among section_names in one query, keyed by name"""
+        wanted = set(section_names)
+        missing = [name for name in wanted if name not in self._sections]
+        
+        if missing:
+            fetched = {}
+            query = self.db.query(SteelSection).filter(SteelSection.section_name.in_(missing))
+            # Lowest id first, so duplicate names resolve as get_steel_section's first() does
+            for section in query.order_by(SteelSection.id):
+                fetched.setdefault(section.section_name, section)
+            for name in missing:
+                self._remember(name, fetched.get(name))
+        else:
+            fetched = {}
+        
+        sections = {}
+        for name in wanted:
+            section = fetched.get(name) or self._sections.get(name)
+            if section is not None:
+                sections[name] = section
+        return sections
+    
+    def _remember(self, section_name: str, section: Optional[SteelSection]) -> None:
+        if len(self._sections) >= _SECTION_CACHE_MAX:
+            self._sections.pop(next(iter(self._sections)))
+        self._sections[section_name] = section
     
     def get_all_steel_sections(self) -> List[SteelSection]:
         """Get all steel sections"""
@@ -59,49 +130,21 @@ class SteelDatabaseService:
     
     def detect_steel_sections_in_text(self, text: str) -> List[Dict]:
         """Detect steel section references in text including hollow sections"""
-        detected_sections = []
+        # Pass 1: collect every candidate as (section_type, match, section_name,
+        # whether to fall back to similarly named sections)
+        candidates = []
+        # Types sharing a pattern (UB and UC) reuse one scan of the text
+        scans = {}
         
-        # All steel section patterns including hollow sections
-        steel_patterns = {
-            # British Steel sections
-            'UB': r'(\d{3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 305 x 102 x 25
-            'UC': r'(\d{3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 305 x 305 x 118
-            'UA': r'(\d{2,3})\s*x\s*(\d{2,3})\s*x\s*(\d{1,2})',  # 200 x 100 x 10
-            
-            # Hollow sections with prefixes
-            'CHS': r'CHS\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # CHS 21.3 x 3.0
-            'RHS': r'RHS\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # RHS 50 x 30 x 3.2
-            'SHS': r'SHS\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # SHS 20 x 20 x 2.0
-            
-            # Hollow sections without prefixes (need to be detected by context)
-            'CHS_IMPLICIT': r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)(?!\s*x)',  # 21.3 x 3.0 (two dimensions)
-            'RHS_IMPLICIT': r'(\d+\.?\d*)\s*x\s*(\d+\.?\d*)\s*x\s*(\d+\.?\d*)',  # 50 x 30 x 3.2 (three dimensions)
-        }
-        
-        for section_type, pattern in steel_patterns.items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for section_type, pattern in _STEEL_SECTION_PATTERNS.items():
+            if pattern not in scans:
+                scans[pattern] = list(pattern.finditer(text))
+            for match in scans[pattern]:
                 if section_type in ['CHS', 'CHS_IMPLICIT']:
                     # Circular Hollow Section
                     diameter = match.group(1)
                     thickness = match.group(2)
-                    section_name = f"CHS {diameter} x {thickness}"
-                    
-                    # Search for this section in database
-                    db_section = self.get_steel_section(section_name)
-                    
-                    if db_section:
-                        detected_sections.append({
-                            'section_name': section_name,
-                            'section_type': 'CHS',
-                            'kg_per_meter': db_section.kg_per_meter,
-                            'confidence': 0.9,
-                            'text_match': match.group(0),
-                            'position': match.span(),
-                            'depth_mm': db_section.depth_mm,
-                            'width_mm': db_section.width_mm,
-                            'thickness_mm': db_section.thickness_mm
-                        })
+                    candidates.append(('CHS', match, f"CHS {diameter} x {thickness}", False))
                 
                 elif section_type in ['RHS', 'RHS_IMPLICIT']:
                     # Rectangular or Square Hollow Section
@@ -111,63 +154,52 @@ class SteelDatabaseService:
                     
                     # Determine if it's RHS or SHS based on dimensions
                     if abs(float(width) - float(height)) < 5:  # Similar dimensions suggest SHS
-                        section_type_detected = 'SHS'
-                        section_name = f"SHS {width} x {height} x {thickness}"
+                        candidates.append(('SHS', match, f"SHS {width} x {height} x {thickness}", False))
                     else:
-                        section_type_detected = 'RHS'
-                        section_name = f"RHS {width} x {height} x {thickness}"
-                    
-                    # Search for this section in database
-                    db_section = self.get_steel_section(section_name)
-                    
-                    if db_section:
-                        detected_sections.append({
-                            'section_name': section_name,
-                            'section_type': section_type_detected,
-                            'kg_per_meter': db_section.kg_per_meter,
-                            'confidence': 0.9,
-                            'text_match': match.group(0),
-                            'position': match.span(),
-                            'depth_mm': db_section.depth_mm,
-                            'width_mm': db_section.width_mm,
-                            'thickness_mm': db_section.thickness_mm
-                        })
+                        candidates.append(('RHS', match, f"RHS {width} x {height} x {thickness}", False))
                 
                 else:
                     # British Steel sections (UB, UC, UA)
                     depth = match.group(1)
                     width = match.group(2)
                     thickness = match.group(3)
-                    section_name = f"{depth} x {width} x {thickness}"
-                    
-                    # Search for this section in database
-                    db_section = self.get_steel_section(section_name)
-                    
-                    if db_section:
-                        detected_sections.append({
-                            'section_name': section_name,
-                            'section_type': section_type,
-                            'kg_per_meter': db_section.kg_per_meter,
-                            'confidence': 0.9,
-                            'text_match': match.group(0),
-                            'position': match.span(),
-                            'depth_mm': db_section.depth_mm,
-                            'width_mm': db_section.width_mm,
-                            'thickness_mm': db_section.thickness_mm
-                        })
-                    else:
-                        # Try to find similar sections
-                        similar_sections = self.search_steel_sections(section_name)
-                        if similar_sections:
-                            detected_sections.append({
-                                'section_name': section_name,
-                                'section_type': section_type,
-                                'kg_per_meter': similar_sections[0].kg_per_meter,
-                                'confidence': 0.7,
-                                'text_match': match.group(0),
-                                'position': match.span(),
-                                'note': f"Similar to {similar_sections[0].section_name}"
-                            })
+                    candidates.append((section_type, match, f"{depth} x {width} x {thickness}", True))
+        
+        # Pass 2: look every candidate name up in one query
+        db_sections = self.get_steel_sections({name for _, _, name, _ in candidates})
+        similar_by_name = {}
+        
+        detected_sections = []
+        for section_type, match, section_name, find_similar in candidates:
+            db_section = db_sections.get(section_name)
+            
+            if db_section:
+                detected_sections.append({
+                    'section_name': section_name,
+                    'section_type': section_type,
+                    'kg_per_meter': db_section.kg_per_meter,
+                    'confidence': 0.9,
+                    'text_match': match.group(0),
+                    'position': match.span(),
+                    'depth_mm': db_section.depth_mm,
+                    'width_mm': db_section.width_mm,
+                    'thickness_mm': db_section.thickness_mm
+                })
+            elif find_similar:
+                # Try to find similar sections, once per distinct name
+                if section_name not in similar_by_name:
+                    similar_by_name[section_name] = self.search_steel_sections(section_name)
+                similar_sections = similar_by_name[section_name]
+                if similar_sections:
+                    detected_sections.append({
+                        'section_name': section_name,
+                        'section_type': section_type,
+                        'kg_per_meter': similar_sections[0].kg_per_meter,
+                        'confidence': 0.7,
+                        'text_match': match.group(0),
+                        'position': match.span(),
+                        'note': f"Similar to {similar_sections[0].section_name}"
+                    })
         
         return detected_sections
     
@@ -186,12 +218,10 @@ class SteelDatabaseService:
             # Extract text from PDF using PyMuPDF
             import fitz  # PyMuPDF
             doc = fitz.open(image_path)
-            text_content = ""
-            
-            for page in doc:
-                text_content += page.get_text()
-            
-            doc.close()
+            try:
+                text_content = "".join(page.get_text() for page in doc)
+            finally:
+                doc.close()
             
             logger.info(f"Extracted text from drawing {drawing_id}: {len(text_content)} characters")
             
@@ -199,7 +229,7 @@ class SteelDatabaseService:
             detected_sections = self.detect_steel_sections_in_text(text_content)
             logger.info(f"Detected {len(detected_sections)} steel sections in text")
             
-            steel_elements = []
+            rows = []
             for section in detected_sections:
                 # For now, use a default length of 6000mm (6m) - this should be improved
                 length_mm = 6000.0
@@ -216,15 +246,14 @@ class SteelDatabaseService:
                     length_mm=length_mm,
                     mass_kg=mass_kg,
                     confidence_score=section['confidence'],
-                    bbox=json.dumps([0, 0, 100, 100]),  # Default bbox
-                    text_references=json.dumps([section['text_match']]),
-                    properties=json.dumps(section)
+                    bbox=[0, 0, 100, 100],  # Default bbox
+                    text_references=[section['text_match']],
+                    properties=section
                 )
                 
-                db_steel_element = SteelElement(**steel_element_data.dict())
-                self.db.add(db_steel_element)
-                steel_elements.append(db_steel_element)
+                rows.append(steel_element_data.dict())
             
+            steel_elements = SteelElement.bulk_create(self.db, rows)
             self.db.commit()
             logger.info(f"Detected {len(steel_elements)} steel elements in drawing {drawing_id}")
             return steel_elements
@@ -273,27 +302,42 @@ class SteelDatabaseService:
         logger.info(f"Importing British Steel database from PDF: {pdf_path}")
         
         try:
-            # Extract text from PDF
+            # Parse British Steel sections page by page, so the whole
+            # document's text is never held in memory at once
             import fitz  # PyMuPDF
             doc = fitz.open(pdf_path)
-            text_content = ""
-            
-            for page in doc:
-                text_content += page.get_text()
-            
-            doc.close()
+            try:
+                imported_sections = self._parse_british_steel_sections_from_lines(
+                    line for page in doc for line in page.get_text().splitlines()
+                )
+            finally:
+                doc.close()
             
-            # Parse British Steel sections from text
-            imported_sections = self._parse_british_steel_sections_from_text(text_content)
+            # Sections already in the database, looked up in one query, are
+            # skipped so re-importing a datasheet doesn't duplicate rows
+            names = {section_data.get('section_name') for section_data in imported_sections}
+            seen = {
+                name for (name,) in
+                self.db.query(SteelSection.section_name).filter(SteelSection.section_name.in_(names))
+            }
             
-            # Add to database
-            added_count = 0
+            # Validate sections, then add them to the database in one batch
+            mappings = []
             for section_data in imported_sections:
+                if section_data.get('section_name') in seen:
+                    continue
                 try:
-                    self.add_steel_section(SteelSectionCreate(**section_data))
-                    added_count += 1
+                    mapping = SteelSectionCreate(**section_data).dict()
                 except Exception as e:
                     logger.error(f"Failed to add section {section_data.get('section_name', 'unknown')}: {e}")
+                    continue
+                mappings.append(mapping)
+                seen.add(mapping['section_name'])
+            
+            self.db.bulk_insert_mappings(SteelSection, mappings)
+            self.db.commit()
+            self._sections.clear()
+            added_count = len(mappings)
             
             return {
                 "success": True,
@@ -303,6 +347,7 @@ class SteelDatabaseService:
             }
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Failed to import British Steel database: {e}")
             return {
                 "success": False,
@@ -312,11 +357,12 @@ class SteelDatabaseService:
     
     def _parse_british_steel_sections_from_text(self, text: str) -> List[Dict]:
         """Parse British Steel sections from text content"""
+        return self._parse_british_steel_sections_from_lines(text.split('\n'))
+    
+    def _parse_british_steel_sections_from_lines(self, lines: Iterable[str]) -> List[Dict]:
+        """Parse British Steel sections from an iterable of text lines"""
         sections = []
         
-        # Split text into lines
-        lines = text.split('\n')
-        
         current_section_type = None
         
         for line in lines:
@@ -357,7 +403,7 @@ class SteelDatabaseService:
         line = line.strip()
         
         # Approach 1: Look for dimension pattern at start of line
-        dimension_match = re.match(r'(\d+)\s*x\s*(\d+)\s*x\s*(\d+)', line)
+        dimension_match = _SECTION_DIMENSIONS_RE.match(line)
         if dimension_match:
             depth = int(dimension_match.group(1))
             width = int(dimension_match.group(2))
@@ -380,12 +426,12 @@ class SteelDatabaseService:
                 }
         
         # Approach 2: Split by | or spaces and look for patterns
-        parts = re.split(r'\s*\|\s*|\s+', line)
+        parts = _COLUMN_SEPARATOR_RE.split(line)
         
         if len(parts) >= 4:
             # Look for dimension pattern in first part
             first_part = parts[0]
-            dimension_match = re.match(r'(\d+)\s*x\s*(\d+)\s*x\s*(\d+)', first_part)
+            dimension_match = _SECTION_DIMENSIONS_RE.match(first_part)
             
             if dimension_match:
                 depth = int(dimension_match.group(1))
@@ -422,33 +468,17 @@ class SteelDatabaseService:
     def _extract_kg_per_meter_from_line(self, line: str) -> Optional[float]:
         """Extract kg/m value from a line of text"""
         # Look for kg/m patterns
-        kg_patterns = [
-            r'(\d+\.?\d*)\s*kg/m',
-            r'(\d+\.?\d*)\s*kg/meter',
-            r'(\d+\.?\d*)\s*kg/m²',
-            r'(\d+\.?\d*)\s*kg/m2',
-        ]
-        
-        for pattern in kg_patterns:
-            matches = re.findall(pattern, line, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match)
-                    if 5.0 <= value <= 1000.0:  # Reasonable range for kg/m
-                        return value
-                except ValueError:
-                    continue
+        for match in _KG_PER_METER_RE.finditer(line):
+            value = float(match.group(1))
+            if 5.0 <= value <= 1000.0:  # Reasonable range for kg/m
+                return value
         
         # If no explicit kg/m pattern, look for the first reasonable number after dimensions
         # This handles cases where kg/m is just a number in the data
-        numbers = re.findall(r'\b(\d+\.?\d*)\b', line)
-        for number in numbers:
-            try:
-                value = float(number)
-                if 5.0 <= value <= 1000.0:  # Reasonable range for kg/m
-                    return value
-            except ValueError:
-                continue
+        for match in _NUMBER_RE.finditer(line):
+            value = float(match.group(1))
+            if 5.0 <= value <= 1000.0:  # Reasonable range for kg/m
+                return value
         
         return None
     
@@ -459,24 +489,4 @@ class SteelDatabaseService:
     
     def _parse_steel_sections_from_text(self, text: str) -> List[Dict]:
         """Parse steel sections from text content (legacy method)"""
-        return self._parse_british_steel_sections_from_text(text)
-    
-    def _extract_kg_per_meter(self, line: str) -> Optional[float]:
-        """Extract kg/m value from text line"""
-        # Look for kg/m patterns
-        kg_patterns = [
-            r'(\d+\.?\d*)\s*kg/m',
-            r'(\d+\.?\d*)\s*kg/meter',
-            r'(\d+\.?\d*)\s*kg/m²',
-            r'(\d+\.?\d*)\s*kg/m2'
-        ]
-        
-        for pattern in kg_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                try:
-                    return float(match.group(1))
-                except ValueError:
-                    continue
-        
-        return None 
\ No newline at end of file
+        return self._parse_british_steel_sections_from_text(text)
\ No newline at end of file
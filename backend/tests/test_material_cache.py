@@ -0,0 +1,65 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models.material_cache as material_cache
+from app.core.database import Base
+from app.models.models import Material
+
+
+class TestMaterialCacheInvalidation:
+    def setup_method(self):
+        # A file database, so the cache's own session sees only committed rows
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'test.db')}")
+        Base.metadata.create_all(self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.patches = pytest.MonkeyPatch()
+        self.patches.setattr(material_cache, "SessionLocal", self.Session)
+        material_cache.clear_material_cache()
+
+        db = self.Session()
+        material = Material(name="Concrete", unit_cost=100.0, unit="m3", carbon_factor=0.2)
+        db.add(material)
+        db.commit()
+        self.material_id = material.id
+        db.close()
+
+    def teardown_method(self):
+        material_cache.clear_material_cache()
+        self.patches.undo()
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _update_cost(self, db, unit_cost):
+        db.get(Material, self.material_id).unit_cost = unit_cost
+        db.flush()
+
+    def test_lookup_between_flush_and_commit_is_not_left_stale(self):
+        db = self.Session()
+        self._update_cost(db, 150.0)
+        # Cached while the write is flushed but not yet committed
+        material_cache.get_material(self.material_id)
+        db.commit()
+        db.close()
+
+        assert material_cache.get_material(self.material_id).unit_cost == 150.0
+
+    def test_rolled_back_write_keeps_committed_row(self):
+        db = self.Session()
+        self._update_cost(db, 150.0)
+        db.rollback()
+        db.close()
+
+        assert material_cache.get_material(self.material_id).unit_cost == 100.0
+
+    def test_unrelated_commit_keeps_cache(self):
+        material_cache.get_material(self.material_id)
+        db = self.Session()
+        db.commit()
+        db.close()
+
+        assert self.material_id in material_cache._materials
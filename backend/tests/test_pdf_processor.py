@@ -2,6 +2,8 @@ import pytest
 import os
 import tempfile
 from unittest.mock import Mock, patch
+import numpy as np
+import app.services.pdf_processor as pdf_processor_module
 from app.services.pdf_processor import PDFProcessor
 
 
@@ -138,5 +140,24 @@ class TestPDFProcessor:
         """Test PDF processing with error"""
         results = self.processor.process_pdf_drawing('nonexistent_file.pdf')
         
-        assert results['status'] == 'failed'
-        assert 'error' in results 
\ No newline at end of file
+        assert results['status'] == 'error'
+        assert 'error' in results 
+
+class TestGeometricKernelParity:
+    """The numba kernel and the NumPy path classify rects identically"""
+
+    @pytest.mark.skipif(not pdf_processor_module.GEOM_KERNELS_AVAILABLE, reason="numba not installed")
+    @pytest.mark.parametrize("discipline", ["architectural", "structural", "civil", "mep", "other"])
+    def test_kernel_matches_numpy_path(self, discipline, monkeypatch):
+        rng = np.random.default_rng(0)
+        rects = rng.integers(0, 400, size=(5000, 4), dtype=np.int32)
+        rects[::50, 3] = 0  # zero-height rects have no aspect ratio
+        processor = pdf_processor_module.pdf_processor
+
+        compiled = processor._detect_elements_by_discipline(rects, discipline)
+        monkeypatch.setattr(pdf_processor_module, "GEOM_KERNELS_AVAILABLE", False)
+        fallback = processor._detect_elements_by_discipline(rects, discipline)
+
+        assert compiled.types == fallback.types
+        np.testing.assert_array_equal(compiled.type_ids, fallback.type_ids)
+        np.testing.assert_array_equal(compiled.rects, fallback.rects)
@@ -0,0 +1,206 @@
+import pytest
+from contextlib import contextmanager
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, raiseload
+from sqlalchemy.pool import StaticPool
+
+import app.main as main_module
+import app.models.material_cache as material_cache
+from app.core.database import Base
+from app.models.models import Project, Drawing, Element, Material, SteelSection
+from app.services.steel_database import SteelDatabaseService
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect every SQL statement executed on the engine"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+class TestListEndpointQueryCounts:
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        # Any relationship an endpoint didn't load explicitly raises instead of
+        # quietly issuing one SELECT per row
+        @event.listens_for(TestingSession, "do_orm_execute")
+        def _raise_on_lazy_load(state):
+            if state.is_select and not state.is_relationship_load:
+                state.statement = state.statement.options(raiseload("*", sql_only=True))
+
+        self.patches = pytest.MonkeyPatch()
+        self.patches.setattr(main_module, "SessionLocal", TestingSession)
+        self.patches.setattr(material_cache, "SessionLocal", TestingSession)
+        material_cache.clear_material_cache()
+        self.client = TestClient(main_module.app)
+
+        db = TestingSession()
+        material = Material(name="Concrete", unit_cost=100.0, unit="m3", carbon_factor=0.2)
+        db.add(material)
+        self.project = Project(name="Test project")
+        db.add(self.project)
+        db.flush()
+        for i in range(5):
+            drawing = Drawing(project_id=self.project.id, filename=f"{i}.pdf", file_path=f"uploads/{i}.pdf", file_type=".pdf")
+            db.add(drawing)
+            db.flush()
+            for _ in range(3):
+                db.add(Element(
+                    project_id=self.project.id, drawing_id=drawing.id, material_id=material.id,
+                    element_type="wall", quantity=2.0, unit="m2", area=2.0,
+                ))
+        db.commit()
+        self.project_id = self.project.id
+        db.close()
+
+    def teardown_method(self):
+        self.patches.undo()
+        self.engine.dispose()
+
+    def _get(self, url):
+        with count_queries(self.engine) as statements:
+            response = self.client.get(url)
+        assert response.status_code == 200, response.text
+        return response.json(), statements
+
+    def test_project_list(self):
+        body, statements = self._get("/api/v1/projects/")
+        assert len(body) == 1
+        assert len(statements) <= 1
+
+    def test_drawing_list_with_elements(self):
+        body, statements = self._get("/api/v1/drawings/")
+        assert len(body) == 5
+        assert all(len(drawing["elements"]) == 3 for drawing in body)
+        assert len(statements) <= 2
+
+    def test_project_drawings(self):
+        body, statements = self._get(f"/api/v1/drawings/project/{self.project_id}")
+        assert len(body) == 5
+        assert len(statements) <= 3
+
+    def test_project_elements(self):
+        body, statements = self._get(f"/api/v1/elements/project/{self.project_id}")
+        assert len(body) == 15
+        assert "bounding_box" not in body[0]
+        assert len(statements) <= 2
+
+    def test_project_summary(self):
+        body, statements = self._get(f"/api/v1/projects/{self.project_id}/summary")
+        assert body["statistics"] == {"drawings": 5, "elements": 15, "reports": 0}
+        assert len(statements) <= 3
+
+    def test_project_costs(self):
+        body, statements = self._get(f"/api/v1/analysis/project/{self.project_id}/costs")
+        assert body["total_elements"] == 15
+        assert len(statements) <= 2
+
+    def test_all_project_costs(self):
+        body, statements = self._get("/api/v1/analysis/costs")
+        assert body["total_elements"] == 15
+        assert body["project_count"] == 1
+        assert len(statements) <= 2
+
+
+
+class TestWriteEndpointQueryCounts:
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        TestingSession = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.patches = pytest.MonkeyPatch()
+        self.patches.setattr(main_module, "SessionLocal", TestingSession)
+        self.client = TestClient(main_module.app)
+
+        db = TestingSession()
+        project = Project(name="Test project")
+        db.add(project)
+        db.flush()
+        for i in range(5):
+            drawing = Drawing(project_id=project.id, filename=f"{i}.pdf", file_path=f"uploads/{i}.pdf", file_type=".pdf")
+            db.add(drawing)
+            db.flush()
+            for _ in range(3):
+                db.add(Element(project_id=project.id, drawing_id=drawing.id, element_type="wall", quantity=2.0, unit="m2"))
+        db.commit()
+        self.project_id = project.id
+        db.close()
+
+    def teardown_method(self):
+        self.patches.undo()
+        self.engine.dispose()
+
+    def test_update_project_skips_relationships(self):
+        with count_queries(self.engine) as statements:
+            response = self.client.put(f"/api/v1/projects/{self.project_id}", json={"location": "Leeds"})
+        assert response.status_code == 200, response.text
+        assert response.json()["location"] == "Leeds"
+        assert not any("FROM drawings" in s or "FROM elements" in s for s in statements)
+        # Load, update, refresh
+        assert len(statements) <= 3
+
+    def test_create_project_skips_relationships(self):
+        with count_queries(self.engine) as statements:
+            response = self.client.post("/api/v1/projects/", json={"name": "New project"})
+        assert response.status_code == 201, response.text
+        assert not any("FROM drawings" in s or "FROM elements" in s for s in statements)
+        # Insert, refresh
+        assert len(statements) <= 2
+
+
+class TestSteelDetectionQueryCounts:
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)()
+        self.db.add_all([
+            SteelSection(section_name="305 x 102 x 25", section_type="UB", kg_per_meter=24.8),
+            SteelSection(section_name="CHS 21.3 x 3.0", section_type="CHS", kg_per_meter=1.43),
+            SteelSection(section_name="RHS 200 x 100 x 8", section_type="RHS", kg_per_meter=34.4),
+        ])
+        self.db.commit()
+        self.service = SteelDatabaseService(self.db)
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_detection_query_count_independent_of_matches(self):
+        text = " ".join(["305 x 102 x 25", "CHS 21.3 x 3.0", "RHS 200 x 100 x 8", "999 x 99 x 9"] * 50)
+        with count_queries(self.engine) as statements:
+            sections = self.service.detect_steel_sections_in_text(text)
+        assert {s["section_name"] for s in sections} >= {"305 x 102 x 25", "CHS 21.3 x 3.0", "RHS 200 x 100 x 8"}
+        # One IN query for the candidates plus one similarity search per unknown name
+        assert len(statements) <= 3
+
+    def test_mass_after_detection_reuses_looked_up_sections(self):
+        sections = self.service.detect_steel_sections_in_text("305 x 102 x 25 and CHS 21.3 x 3.0, 999 x 99 x 9")
+        with count_queries(self.engine) as statements:
+            masses = [self.service.calculate_steel_mass(s["section_name"], 6000.0) for s in sections]
+        assert masses[0] == pytest.approx(24.8 * 6)
+        assert statements == []
+
@@ -17,7 +17,6 @@ import re
 from dataclasses import dataclass
 from enum import Enum
 import fitz  # PyMuPDF
-from PIL import Image
 import io
 
 # Configure logging
@@ -149,15 +149,12 @@ class DrawingReferenceAnalyzer:
         try:
             if drawing_path.lower().endswith('.pdf'):
                 import fitz
-                pdf_document = fitz.open(drawing_path)
-                page = pdf_document[0]
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat)
-                img_data = pix.tobytes("png")
-                from PIL import Image
-                import io
-                img = Image.open(io.BytesIO(img_data))
-                return np.array(img)
+                with fitz.open(drawing_path) as pdf_document:
+                    page = pdf_document[0]
+                    mat = fitz.Matrix(2.0, 2.0)
+                    pix = page.get_pixmap(matrix=mat, alpha=False)
+                # Wrap the RGB samples directly rather than round-tripping through PNG
+                return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
             else:
                 return cv2.imread(drawing_path)
         except Exception as e:
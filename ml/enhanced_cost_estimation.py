@@ -60,7 +60,28 @@ class EnhancedCostEstimator:
             detection_results = self.enhanced_system.detect_elements_enhanced(
                 image, discipline, use_ocr=True
             )
+        except Exception as e:
+            logger.error(f"Error in enhanced cost analysis: {e}")
+            return self._create_error_analysis(str(e))
+        
+        return self.analyze_detection_costs(detection_results, project_scale)
+    
+    def analyze_detection_costs(self, 
+                               detection_results: Dict[str, Any],
+                               project_scale: str = "medium") -> EnhancedCostAnalysis:
+        """
+        Analyze costs for elements already found by detect_elements_enhanced.
+        
+        Lets callers run detection once and price it for several project scales.
+        
+        Args:
+            detection_results: Output of EnhancedInferenceSystem.detect_elements_enhanced
+            project_scale: Project scale (small, medium, large)
             
+        Returns:
+            Enhanced cost analysis results
+        """
+        try:
             elements = detection_results.get('elements', [])
             extracted_texts = detection_results.get('extracted_texts', [])
             
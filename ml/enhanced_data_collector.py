@@ -15,9 +15,7 @@ import logging
 from datetime import datetime
 import hashlib
 import fitz  # PyMuPDF
-from PIL import Image
 import matplotlib.pyplot as plt
-import io
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -260,17 +258,15 @@ class EnhancedDataCollector:
     def _pdf_to_image(self, pdf_path: str) -> np.ndarray:
         """Convert PDF to image for analysis."""
         try:
-            pdf_document = fitz.open(pdf_path)
-            page = pdf_document[0]  # First page
-            
-            # Convert to image with high resolution
-            mat = fitz.Matrix(2.0, 2.0)
-            pix = page.get_pixmap(matrix=mat)
+            with fitz.open(pdf_path) as pdf_document:
+                page = pdf_document[0]  # First page
+                
+                # Convert to image with high resolution
+                mat = fitz.Matrix(2.0, 2.0)
+                pix = page.get_pixmap(matrix=mat, alpha=False)
             
-            # Convert to numpy array
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-            return np.array(img)
+            # Wrap the RGB samples directly rather than round-tripping through PNG
+            return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
             
         except Exception as e:
             logger.error(f"Error converting PDF to image: {e}")
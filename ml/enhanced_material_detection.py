@@ -15,6 +15,9 @@ from material_text_analyzer import MaterialTextAnalyzer, MaterialElement
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Wood grain kernel, built once rather than per element region
+_HORIZONTAL_GRAIN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
+
 @dataclass
 class EnhancedElement:
     """Enhanced element with material and confidence information"""
@@ -519,8 +522,7 @@ class EnhancedMaterialDetector:
         gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY) if len(region.shape) == 3 else region
         
         # Look for horizontal grain patterns
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
-        horizontal_lines = cv2.morphologyEx(gray, cv2.MORPH_OPEN, horizontal_kernel)
+        horizontal_lines = cv2.morphologyEx(gray, cv2.MORPH_OPEN, _HORIZONTAL_GRAIN_KERNEL)
         
         grain_density = np.sum(horizontal_lines > 0) / horizontal_lines.size
         return grain_density > 0.02  # Threshold for grain detection
@@ -0,0 +1,42 @@
+"""
+Compiled kernels for geometric element detection
+
+Numba-compiled loops over contour bounding rects. Classifying every rect in
+one fused loop avoids the intermediate boolean arrays a NumPy version
+allocates per criterion.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True)
+def classify_rects(rects: np.ndarray, ratio_bounds: np.ndarray, area_bounds: np.ndarray) -> np.ndarray:
+    """
+    Classify bounding rects against ordered element criteria.
+
+    Args:
+        rects: (N, 4) int32 array of x, y, w, h
+        ratio_bounds: (K, 2) float64 array of inclusive (min, max) aspect ratios
+        area_bounds: (K, 2) float64 array of inclusive (min, max) areas
+
+    Returns:
+        (N,) int8 array with the index of the first matching criterion per
+        rect, or -1 where none matched
+    """
+    n = rects.shape[0]
+    type_index = np.full(n, -1, dtype=np.int8)
+
+    for i in prange(n):
+        w = rects[i, 2]
+        h = rects[i, 3]
+        area = np.int64(w) * h
+        aspect_ratio = w / h if h > 0 else 0.0
+
+        for k in range(ratio_bounds.shape[0]):
+            if (ratio_bounds[k, 0] <= aspect_ratio <= ratio_bounds[k, 1] and
+                    area_bounds[k, 0] <= area <= area_bounds[k, 1]):
+                type_index[i] = k
+                break
+
+    return type_index
@@ -15,6 +15,10 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Line-detection kernels, built once rather than per analysed region
+_HORIZONTAL_LINE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
+_VERTICAL_LINE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 25))
+
 @dataclass
 class MaterialText:
     """Represents detected material-related text"""
@@ -255,11 +259,8 @@ class MaterialTextAnalyzer:
         features['edge_density'] = np.sum(edges > 0) / edges.size
         
         # Horizontal and vertical line density
-        horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
-        vertical_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 25))
-        
-        horizontal_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, horizontal_kernel)
-        vertical_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, vertical_kernel)
+        horizontal_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, _HORIZONTAL_LINE_KERNEL)
+        vertical_lines = cv2.morphologyEx(gray_image, cv2.MORPH_OPEN, _VERTICAL_LINE_KERNEL)
         
         features['horizontal_density'] = np.sum(horizontal_lines > 0) / horizontal_lines.size
         features['vertical_density'] = np.sum(vertical_lines > 0) / vertical_lines.size
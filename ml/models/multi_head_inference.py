@@ -26,6 +26,15 @@ class Discipline(Enum):
     CIVIL = "civil"
     MEP = "mep"
 
+def _bounding_rects(contours) -> np.ndarray:
+    """Bounding rects of contours as an (N, 4) int32 array of x, y, w, h"""
+    rects = np.array([cv2.boundingRect(contour) for contour in contours], dtype=np.int32)
+    return rects.reshape(-1, 4)
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise numerator / denominator, 0 where the denominator is 0"""
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
 @dataclass
 class DetectionResult:
     """Result of element detection."""
@@ -72,6 +81,19 @@ class BaseDetector:
                 image = image.astype(np.uint8)
         
         return image
+        
+    def find_contours(self, image: np.ndarray) -> Tuple[Tuple[np.ndarray, ...], np.ndarray]:
+        """External contours of the image's edges, with their bounding rects.
+        
+        Computed once per image and shared by every contour-based element pass.
+        """
+        # Edge detection
+        edges = cv2.Canny(image, 50, 150)
+        
+        # Find contours
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        return contours, _bounding_rects(contours)
 
 class ArchitecturalDetector(BaseDetector):
     """Detector for architectural elements."""
@@ -104,20 +126,21 @@ class ArchitecturalDetector(BaseDetector):
             
         results = []
         processed_image = self.preprocess_image(image)
+        contours, rects = self.find_contours(processed_image)
         
         # Geometric detection for architectural elements
         # This replaces the current simple contour detection with discipline-specific logic
         
         # Detect walls (long rectangular shapes)
-        walls = self._detect_walls(processed_image)
+        walls = self._detect_walls(contours, rects)
         results.extend(walls)
         
         # Detect doors (rectangular openings in walls)
-        doors = self._detect_doors(processed_image)
+        doors = self._detect_doors(rects)
         results.extend(doors)
         
         # Detect windows (smaller rectangular openings)
-        windows = self._detect_windows(processed_image)
+        windows = self._detect_windows(rects)
         results.extend(windows)
         
         # Detect rooms (enclosed areas)
@@ -127,104 +150,84 @@ class ArchitecturalDetector(BaseDetector):
         logger.info(f"Detected {len(results)} architectural elements")
         return results
         
-    def _detect_walls(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_walls(self, contours, rects: np.ndarray) -> List[DetectionResult]:
         """Detect walls using contour analysis."""
         results = []
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Wall criteria: long and thin, with a minimum area
+        candidates = np.flatnonzero(((aspect_ratio > 3) | (aspect_ratio < 0.33)) & (w * h > 1000))
         
-        for i, contour in enumerate(contours):
+        for i in candidates:
             # Approximate contour to polygon
+            contour = contours[i]
             epsilon = 0.02 * cv2.arcLength(contour, True)
             approx = cv2.approxPolyDP(contour, epsilon, True)
             
             # Check if it's a rectangle (wall-like)
             if len(approx) == 4:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Wall criteria: long and thin
-                aspect_ratio = w / h if h > 0 else 0
-                if aspect_ratio > 3 or aspect_ratio < 0.33:
-                    if w * h > 1000:  # Minimum area
-                        results.append(DetectionResult(
-                            element_type="wall",
-                            bbox=[x, y, x + w, y + h],
-                            confidence=0.85,
-                            properties={
-                                "length": max(w, h),
-                                "thickness": min(w, h),
-                                "area": w * h
-                            },
-                            discipline=self.discipline
-                        ))
+                x, y, w, h = rects[i].tolist()
+                results.append(DetectionResult(
+                    element_type="wall",
+                    bbox=[x, y, x + w, y + h],
+                    confidence=0.85,
+                    properties={
+                        "length": max(w, h),
+                        "thickness": min(w, h),
+                        "area": w * h
+                    },
+                    discipline=self.discipline
+                ))
         
         return results
         
-    def _detect_doors(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_doors(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect doors using template matching and contour analysis."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
-        
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Door criteria: door proportions and size range
+        mask = (0.3 < aspect_ratio) & (aspect_ratio < 0.8) & (500 < w * h) & (w * h < 5000)
         
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Door criteria: rectangular, medium size
-            aspect_ratio = w / h if h > 0 else 0
-            if 0.3 < aspect_ratio < 0.8:  # Door proportions
-                if 500 < w * h < 5000:  # Door size range
-                    results.append(DetectionResult(
-                        element_type="door",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.80,
-                        properties={
-                            "width": w,
-                            "height": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="door",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.80,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
-    def _detect_windows(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_windows(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect windows using contour analysis."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        # Window criteria: smaller than doors, rectangular
+        mask = (0.5 < aspect_ratio) & (aspect_ratio < 2.0) & (100 < w * h) & (w * h < 2000)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Window criteria: smaller than doors, rectangular
-            aspect_ratio = w / h if h > 0 else 0
-            if 0.5 < aspect_ratio < 2.0:  # Window proportions
-                if 100 < w * h < 2000:  # Window size range
-                    results.append(DetectionResult(
-                        element_type="window",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.75,
-                        properties={
-                            "width": w,
-                            "height": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="window",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.75,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
     def _detect_rooms(self, image: np.ndarray) -> List[DetectionResult]:
         """Detect rooms using connected component analysis."""
@@ -286,84 +289,69 @@ class StructuralDetector(BaseDetector):
             
         results = []
         processed_image = self.preprocess_image(image)
+        _, rects = self.find_contours(processed_image)
         
         # Structural-specific detection
-        beams = self._detect_beams(processed_image)
+        beams = self._detect_beams(rects)
         results.extend(beams)
         
-        columns = self._detect_columns(processed_image)
+        columns = self._detect_columns(rects)
         results.extend(columns)
         
         slabs = self._detect_slabs(processed_image)
         results.extend(slabs)
         
-        foundations = self._detect_foundations(processed_image)
+        foundations = self._detect_foundations(rects, processed_image.shape[0])
         results.extend(foundations)
         
         logger.info(f"Detected {len(results)} structural elements")
         return results
         
-    def _detect_beams(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_beams(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect beams (horizontal structural elements)."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        # Beam criteria: long horizontal elements with a minimum area
+        mask = (aspect_ratio > 4) & (w * h > 2000)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Beam criteria: long horizontal elements
-            aspect_ratio = w / h if h > 0 else 0
-            if aspect_ratio > 4:  # Very long and thin
-                if w * h > 2000:  # Minimum beam area
-                    results.append(DetectionResult(
-                        element_type="beam",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.90,
-                        properties={
-                            "length": w,
-                            "depth": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="beam",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.90,
+                properties={
+                    "length": w,
+                    "depth": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
-    def _detect_columns(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_columns(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect columns (vertical structural elements)."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(h, w)
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
-        
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Column criteria: tall vertical elements
-            aspect_ratio = h / w if w > 0 else 0
-            if aspect_ratio > 2:  # Tall and narrow
-                if w * h > 1000:  # Minimum column area
-                    results.append(DetectionResult(
-                        element_type="column",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.85,
-                        properties={
-                            "width": w,
-                            "height": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
+        # Column criteria: tall vertical elements with a minimum area
+        mask = (aspect_ratio > 2) & (w * h > 1000)
         
-        return results
+        return [
+            DetectionResult(
+                element_type="column",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.85,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
     def _detect_slabs(self, image: np.ndarray) -> List[DetectionResult]:
         """Detect slabs (horizontal surfaces)."""
@@ -398,37 +386,27 @@ class StructuralDetector(BaseDetector):
         
         return results
         
-    def _detect_foundations(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_foundations(self, rects: np.ndarray, image_height: int) -> List[DetectionResult]:
         """Detect foundations (base structural elements)."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        # Foundation criteria: large rectangular elements in the bottom 30% of the image
+        mask = (w * h > 5000) & (rects[:, 1] + h > image_height * 0.7)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Foundation criteria: large rectangular elements at bottom
-            if w * h > 5000:  # Large area
-                # Check if near bottom of image (foundation location)
-                image_height = image.shape[0]
-                if y + h > image_height * 0.7:  # Bottom 30% of image
-                    results.append(DetectionResult(
-                        element_type="foundation",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.75,
-                        properties={
-                            "width": w,
-                            "height": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="foundation",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.75,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
 
 class CivilDetector(BaseDetector):
     """Detector for civil engineering elements."""
@@ -459,109 +437,87 @@ class CivilDetector(BaseDetector):
             
         results = []
         processed_image = self.preprocess_image(image)
+        _, rects = self.find_contours(processed_image)
         
         # Civil-specific detection
-        roads = self._detect_roads(processed_image)
+        roads = self._detect_roads(rects)
         results.extend(roads)
         
-        utilities = self._detect_utilities(processed_image)
+        utilities = self._detect_utilities(rects)
         results.extend(utilities)
         
-        drainage = self._detect_drainage(processed_image)
+        drainage = self._detect_drainage(rects)
         results.extend(drainage)
         
         logger.info(f"Detected {len(results)} civil elements")
         return results
         
-    def _detect_roads(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_roads(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect roads and pathways."""
-        results = []
-        
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
-        
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Road criteria: long linear elements
-            aspect_ratio = w / h if h > 0 else 0
-            if aspect_ratio > 3:  # Long and narrow
-                if w * h > 3000:  # Minimum road area
-                    results.append(DetectionResult(
-                        element_type="road",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.85,
-                        properties={
-                            "length": w,
-                            "width": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
+        # Road criteria: long linear elements with a minimum area
+        mask = (aspect_ratio > 3) & (w * h > 3000)
         
-        return results
+        return [
+            DetectionResult(
+                element_type="road",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.85,
+                properties={
+                    "length": w,
+                    "width": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
-    def _detect_utilities(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_utilities(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect utility lines and equipment."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        # Utility criteria: small circular or rectangular elements
+        mask = (100 < w * h) & (w * h < 2000)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Utility criteria: small circular or rectangular elements
-            if 100 < w * h < 2000:  # Utility size range
-                results.append(DetectionResult(
-                    element_type="utility",
-                    bbox=[x, y, x + w, y + h],
-                    confidence=0.70,
-                    properties={
-                        "width": w,
-                        "height": h,
-                        "area": w * h
-                    },
-                    discipline=self.discipline
-                ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="utility",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.70,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
-    def _detect_drainage(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_drainage(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect drainage elements."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
-        
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Drainage criteria: roughly circular, within the drainage size range
+        mask = (0.8 < aspect_ratio) & (aspect_ratio < 1.2) & (200 < w * h) & (w * h < 1500)
         
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Drainage criteria: small circular elements
-            aspect_ratio = w / h if h > 0 else 0
-            if 0.8 < aspect_ratio < 1.2:  # Roughly circular
-                if 200 < w * h < 1500:  # Drainage size range
-                    results.append(DetectionResult(
-                        element_type="drainage",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.75,
-                        properties={
-                            "diameter": (w + h) / 2,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="drainage",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.75,
+                properties={
+                    "diameter": (w + h) / 2,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
 
 class MEPDetector(BaseDetector):
     """Detector for MEP (Mechanical, Electrical, Plumbing) elements."""
@@ -592,108 +548,87 @@ class MEPDetector(BaseDetector):
             
         results = []
         processed_image = self.preprocess_image(image)
+        _, rects = self.find_contours(processed_image)
         
         # MEP-specific detection
-        ducts = self._detect_ducts(processed_image)
+        ducts = self._detect_ducts(rects)
         results.extend(ducts)
         
-        electrical = self._detect_electrical(processed_image)
+        electrical = self._detect_electrical(rects)
         results.extend(electrical)
         
-        plumbing = self._detect_plumbing(processed_image)
+        plumbing = self._detect_plumbing(rects)
         results.extend(plumbing)
         
         logger.info(f"Detected {len(results)} MEP elements")
         return results
         
-    def _detect_ducts(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_ducts(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect HVAC ducts."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
+        aspect_ratio = _ratio(w, h)
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        # Duct criteria: duct proportions and size range
+        mask = (0.5 < aspect_ratio) & (aspect_ratio < 3.0) & (1000 < w * h) & (w * h < 8000)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Duct criteria: rectangular, medium size
-            aspect_ratio = w / h if h > 0 else 0
-            if 0.5 < aspect_ratio < 3.0:  # Duct proportions
-                if 1000 < w * h < 8000:  # Duct size range
-                    results.append(DetectionResult(
-                        element_type="hvac_duct",
-                        bbox=[x, y, x + w, y + h],
-                        confidence=0.80,
-                        properties={
-                            "width": w,
-                            "height": h,
-                            "area": w * h
-                        },
-                        discipline=self.discipline
-                    ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="hvac_duct",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.80,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
-    def _detect_electrical(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_electrical(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect electrical elements."""
-        results = []
-        
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
-        
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        w, h = rects[:, 2], rects[:, 3]
         
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Electrical criteria: small rectangular elements
-            if 100 < w * h < 2000:  # Electrical component size
-                results.append(DetectionResult(
-                    element_type="electrical_panel",
-                    bbox=[x, y, x + w, y + h],
-                    confidence=0.75,
-                    properties={
-                        "width": w,
-                        "height": h,
-                        "area": w * h
-                    },
-                    discipline=self.discipline
-                ))
+        # Electrical criteria: small rectangular elements
+        mask = (100 < w * h) & (w * h < 2000)
         
-        return results
+        return [
+            DetectionResult(
+                element_type="electrical_panel",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.75,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
         
-    def _detect_plumbing(self, image: np.ndarray) -> List[DetectionResult]:
+    def _detect_plumbing(self, rects: np.ndarray) -> List[DetectionResult]:
         """Detect plumbing elements."""
-        results = []
+        w, h = rects[:, 2], rects[:, 3]
         
-        # Edge detection
-        edges = cv2.Canny(image, 50, 150)
+        # Plumbing criteria: small circular or rectangular elements
+        mask = (50 < w * h) & (w * h < 1500)
         
-        # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            
-            # Plumbing criteria: small circular or rectangular elements
-            if 50 < w * h < 1500:  # Plumbing component size
-                results.append(DetectionResult(
-                    element_type="plumbing_pipe",
-                    bbox=[x, y, x + w, y + h],
-                    confidence=0.70,
-                    properties={
-                        "width": w,
-                        "height": h,
-                        "area": w * h
-                    },
-                    discipline=self.discipline
-                ))
-        
-        return results
+        return [
+            DetectionResult(
+                element_type="plumbing_pipe",
+                bbox=[x, y, x + w, y + h],
+                confidence=0.70,
+                properties={
+                    "width": w,
+                    "height": h,
+                    "area": w * h
+                },
+                discipline=self.discipline
+            )
+            for x, y, w, h in rects[mask].tolist()
+        ]
 
 class MultiHeadInferenceSystem:
     """Main multi-head inference system for discipline-specific detection."""
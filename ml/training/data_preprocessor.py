@@ -15,7 +15,6 @@ import logging
 from PIL import Image
 import fitz  # PyMuPDF
 import matplotlib.pyplot as plt
-import io
 from datetime import datetime
 
 # Configure logging
@@ -87,11 +86,10 @@ class DataPreprocessor:
         
         # Convert to image
         mat = fitz.Matrix(2.0, 2.0)  # Scale factor for better quality
-        pix = page.get_pixmap(matrix=mat)
+        pix = page.get_pixmap(matrix=mat, alpha=False)
         
-        # Convert to PIL Image
-        img_data = pix.tobytes("png")
-        img = Image.open(io.BytesIO(img_data))
+        # Wrap the RGB samples as a PIL Image, skipping a PNG encode/decode
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
         
         # Preprocess image
         processed_img = self._preprocess_image(img, target_size)
@@ -145,8 +143,8 @@ class DataPreprocessor:
     
     def _enhance_image(self, img: Image.Image) -> Image.Image:
         """Apply image enhancement techniques."""
-        # Convert to numpy array
-        img_array = np.array(img)
+        # View as a numpy array; cvtColor below writes to a new buffer
+        img_array = np.asarray(img)
         
         # Convert to grayscale for processing
         gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)